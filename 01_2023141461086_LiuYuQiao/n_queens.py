@@ -27,6 +27,12 @@ class NQueens:
         self.diag1 = set()          # 已占用的主对角线 (row - col)
         self.diag2 = set()          # 已占用的副对角线 (row + col)
         
+    def reset_state(self):
+        """清空列和对角线的占用标记"""
+        self.cols.clear()
+        self.diag1.clear()
+        self.diag2.clear()
+        
     def is_safe(self, row: int, col: int) -> bool:
         """
         检查在(row, col)位置放置皇后是否安全
@@ -118,9 +124,7 @@ class NQueens:
         # 重置状态
         self.solutions = []
         self.solution_count = 0
-        self.cols.clear()
-        self.diag1.clear()
-        self.diag2.clear()
+        self.reset_state()
         
         # 开始回溯
         board = [-1] * self.n
@@ -172,6 +176,50 @@ class NQueens:
         return "\n".join(result)
 
 
+class NQueensArray(NQueens):
+    """N皇后问题求解器（数组标记版本）
+    
+    用预先分配的布尔列表代替集合记录占用情况，按列号、row-col+n-1 和 row+col 下标访问，
+    省去每个节点上的哈希插入和删除，搜索过程与 NQueens 完全相同。
+    """
+    
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.offset = n - 1                 # 主对角线下标偏移，使 row-col+n-1 落在 [0, 2n-2]
+        self.cols = [False] * n             # 已占用的列
+        self.diag1 = [False] * (2 * n - 1)  # 已占用的主对角线 (row - col + n - 1)
+        self.diag2 = [False] * (2 * n - 1)  # 已占用的副对角线 (row + col)
+    
+    def reset_state(self):
+        """把所有占用标记重置为 False"""
+        self.cols[:] = [False] * self.n
+        self.diag1[:] = [False] * (2 * self.n - 1)
+        self.diag2[:] = [False] * (2 * self.n - 1)
+    
+    def is_safe(self, row: int, col: int) -> bool:
+        """
+        检查在(row, col)位置放置皇后是否安全，三次列表下标访问
+        
+        Args:
+            row: 行位置
+            col: 列位置
+            
+        Returns:
+            bool: 是否安全
+        """
+        return not (self.cols[col] or
+                    self.diag1[row - col + self.offset] or
+                    self.diag2[row + col])
+    
+    def place_queen(self, row: int, col: int):
+        """在(row, col)位置放置皇后，置位占用标记"""
+        self.cols[col] = self.diag1[row - col + self.offset] = self.diag2[row + col] = True
+    
+    def remove_queen(self, row: int, col: int):
+        """移除(row, col)位置的皇后，清除占用标记"""
+        self.cols[col] = self.diag1[row - col + self.offset] = self.diag2[row + col] = False
+
+
 class NQueensOptimized(NQueens):
     """N皇后问题求解器（位运算优化版本）"""
     
@@ -343,7 +391,7 @@ def interactive_mode():
         solutions, count = solver.solve_bitwise(find_all)
         print("使用位运算优化算法")
     else:
-        solver = NQueens(n)
+        solver = NQueensArray(n)
         solutions, count = solver.solve(find_all)
         print("使用标准回溯算法")
     
@@ -387,7 +435,7 @@ def main():
                 print("N必须大于等于4")
                 return
             
-            solver = NQueens(n)
+            solver = NQueensArray(n)
             start_time = time.time()
             solutions, count = solver.solve(True)
             end_time = time.time()
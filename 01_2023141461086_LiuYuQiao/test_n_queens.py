@@ -5,7 +5,7 @@ N皇后问题测试文件
 
 import time
 import unittest
-from n_queens import NQueens, NQueensOptimized
+from n_queens import NQueens, NQueensArray, NQueensOptimized
 
 class TestNQueens(unittest.TestCase):
     """N皇后问题测试类"""
@@ -54,6 +54,20 @@ class TestNQueens(unittest.TestCase):
                 self.assertEqual(count, expected_count,
                                f"位运算版本N={n}的解数应该是{expected_count}，实际是{count}")
     
+    def test_array_state(self):
+        """测试数组标记版本与集合版本的解完全相同，并且可以重复求解"""
+        for n in range(4, 10):
+            with self.subTest(n=n):
+                expected, _ = NQueens(n).solve(find_all=True)
+                solver = NQueensArray(n)
+                # 单解模式提前返回时会留下占用标记，之后的求解必须先重置
+                _, count = solver.solve(find_all=False)
+                self.assertEqual(count, 1)
+                for _ in range(2):
+                    solutions, count = solver.solve(find_all=True)
+                    self.assertEqual(solutions, expected)
+                    self.assertEqual(count, len(expected))
+    
     def test_solution_validity(self):
         """测试解的有效性"""
         for n in range(4, 8):
@@ -3,21 +3,30 @@ import time
 from typing import List, Tuple
 import numpy as np
 
+def diagonal_counts(population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+#统计种群中每个个体每条斜线上的皇后数，返回形状均为 (pop, 2n-1) 的两个数组
+#第 i 行皇后在第 x 列时，主斜线编号为 i+x，副斜线编号为 i-x+n-1
+    pop, n = population.shape
+    rows = np.arange(n)
+    offsets = np.arange(pop)[:, None] * (2 * n - 1)
+    size = pop * (2 * n - 1)
+    diag1 = np.bincount((offsets + rows + population).ravel(), minlength=size)
+    diag2 = np.bincount((offsets + rows - population + n - 1).ravel(), minlength=size)
+    return diag1.reshape(pop, 2 * n - 1), diag2.reshape(pop, 2 * n - 1)
+
+def population_conflicts(population: np.ndarray) -> np.ndarray:
+#一次计算整个种群 (pop × n) 的冲突数：重复的列数 + 同一斜线上的皇后对数
+    population = np.asarray(population)
+    pop, n = population.shape
+    columns = np.bincount((np.arange(pop)[:, None] * n + population).ravel(), minlength=pop * n)
+    conflicts = n - np.count_nonzero(columns.reshape(pop, n), axis=1)
+    for counts in diagonal_counts(population):
+        conflicts += (counts * (counts - 1) // 2).sum(axis=1)
+    return conflicts
+
 def calculate_conflicts(individual: List[int]) -> int:
 #计算个体的冲突数目
-    n = len(individual)
-    conflicts = 0
-    
-    # 检查行冲突（每个数字只能出现一次）
-    conflicts += n - len(set(individual))
-    
-    # 检查斜线冲突
-    for i in range(n):
-        for j in range(i + 1, n):
-            if abs(i - j) == abs(individual[i] - individual[j]):
-                conflicts += 1
-                
-    return conflicts
+    return int(population_conflicts(np.asarray([individual]))[0])
 
 def fitness(individual: List[int]) -> float:
 #计算适应度值
@@ -34,8 +43,9 @@ def order_crossover(parent1: List[int], parent2: List[int]) -> List[int]:
     child = [-1] * n
     child[cx1:cx2] = parent1[cx1:cx2]
     
-    # 从parent2填充剩余位置
-    remaining = [x for x in parent2 if x not in child[cx1:cx2]]
+    # 从parent2填充剩余位置（用集合判断是否已在中间段中）
+    middle = set(parent1[cx1:cx2])
+    remaining = [x for x in parent2 if x not in middle]
     j = 0
     for i in range(n):
         if child[i] == -1:
@@ -44,13 +54,27 @@ def order_crossover(parent1: List[int], parent2: List[int]) -> List[int]:
             
     return child
 
-def mutate(individual: List[int], mutation_rate: float) -> List[int]:
-#变异操作
-    if random.random() < mutation_rate:
-        n = len(individual)
-        i, j = random.sample(range(n), 2)
-        individual[i], individual[j] = individual[j], individual[i]
-    return individual
+def mutate(individual: np.ndarray, mutation_rate: float,
+           diag1: np.ndarray, diag2: np.ndarray) -> int:
+#变异操作：交换两个位置，同时就地更新该个体的斜线计数，返回冲突数的变化量（O(1)）
+    if random.random() >= mutation_rate:
+        return 0
+    n = len(individual)
+    i, j = random.sample(range(n), 2)
+    a, b = int(individual[i]), int(individual[j])
+    delta = 0
+    # 先移走两个皇后：所在斜线上每少一个皇后，减少 (该线原有皇后数 - 1) 对冲突
+    for row, col in ((i, a), (j, b)):
+        diag1[row + col] -= 1
+        diag2[row - col + n - 1] -= 1
+        delta -= diag1[row + col] + diag2[row - col + n - 1]
+    # 再放到交换后的位置：新斜线上已有几个皇后就增加几对冲突
+    for row, col in ((i, b), (j, a)):
+        delta += diag1[row + col] + diag2[row - col + n - 1]
+        diag1[row + col] += 1
+        diag2[row - col + n - 1] += 1
+    individual[i], individual[j] = b, a
+    return int(delta)
 
 def select_parents(population: List[List[int]], fitnesses: List[float], num_parents: int) -> List[List[int]]:
 #锦标赛
@@ -67,8 +91,9 @@ def genetic_algorithm(n: int, pop_size: int = 100, max_generations: int = 1000)
 #遗传算法
     start_time = time.time()
     
-    # 初始化种群
+    # 初始化种群，冲突数整体计算一次，之后随个体一起保存
     population = [random.sample(range(n), n) for _ in range(pop_size)]
+    conflicts = population_conflicts(np.array(population))
     best_fitness = 0
     best_solution = None
     generation_without_improvement = 0
@@ -76,13 +101,14 @@ def genetic_algorithm(n: int, pop_size: int = 100, max_generations: int = 1000)
     
     for generation in range(max_generations):
         # 计算适应度
-        fitnesses = [fitness(ind) for ind in population]
+        fitnesses = 1.0 / (1.0 + conflicts)
         
         # 更新最优解
-        max_fitness = max(fitnesses)
+        best_index = int(np.argmax(fitnesses))
+        max_fitness = float(fitnesses[best_index])
         if max_fitness > best_fitness:
             best_fitness = max_fitness
-            best_solution = population[fitnesses.index(max_fitness)]
+            best_solution = population[best_index]
             generation_without_improvement = 0
         else:
             generation_without_improvement += 1
@@ -99,22 +125,23 @@ def genetic_algorithm(n: int, pop_size: int = 100, max_generations: int = 1000)
             break
             
         # 选择父代
-        parents = select_parents(population, fitnesses, pop_size // 2)
+        parents = select_parents(population, fitnesses.tolist(), pop_size // 2)
         
         # 精英保留
         elite_size = pop_size // 10
-        elite = sorted(zip(population, fitnesses), key=lambda x: x[1], reverse=True)[:elite_size]
-        elite = [ind for ind, _ in elite]
+        elite_indices = np.argsort(conflicts, kind='stable')[:elite_size]
+        elite = [population[i] for i in elite_indices]
         
-        # 生成新种群
-        new_population = elite.copy()
-        while len(new_population) < pop_size:
-            parent1, parent2 = random.sample(parents, 2)
-            child = order_crossover(parent1, parent2)
-            child = mutate(child, mutation_rate)
-            new_population.append(child)
+        # 生成子代：交叉后整体计算一次冲突数，变异只做 O(1) 的增量更新
+        children = np.array([order_crossover(*random.sample(parents, 2))
+                             for _ in range(pop_size - elite_size)], dtype=np.int64).reshape(-1, n)
+        child_conflicts = population_conflicts(children)
+        diag1, diag2 = diagonal_counts(children)
+        for k in range(len(children)):
+            child_conflicts[k] += mutate(children[k], mutation_rate, diag1[k], diag2[k])
             
-        population = new_population
+        population = elite + children.tolist()
+        conflicts = np.concatenate([conflicts[elite_indices], child_conflicts])
         
         # 每100代打印一次进度
         if generation % 100 == 0:
@@ -31,6 +31,12 @@ class NQueensSolver:
         self.diag1 = set()  # 主对角线 (row - col)
         self.diag2 = set()  # 副对角线 (row + col)
 
+    def reset_state(self):
+        """清空冲突集合"""
+        self.cols.clear()
+        self.diag1.clear()
+        self.diag2.clear()
+
     def is_safe(self, row: int, col: int) -> bool:
         """
         检查在(row, col)位置放置皇后是否安全
@@ -103,9 +109,7 @@ class NQueensSolver:
         """
         self.solutions = []
         self.solution_count = 0
-        self.cols.clear()
-        self.diag1.clear()
-        self.diag2.clear()
+        self.reset_state()
 
         board = [-1] * self.n
         start_time = time.time()
@@ -149,6 +153,41 @@ class NQueensSolver:
             self.print_board(solution)
 
 
+class NQueensArraySolver(NQueensSolver):
+    """N皇后问题求解器（数组标记版本）
+
+    用预先分配的布尔列表代替集合，下标分别为列号、row-col+n-1 和 row+col，
+    每个节点上不再有哈希插入和删除，搜索顺序和结果与 NQueensSolver 相同。
+    """
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.offset = n - 1  # 主对角线下标偏移
+        self.cols = [False] * n
+        self.diag1 = [False] * (2 * n - 1)
+        self.diag2 = [False] * (2 * n - 1)
+
+    def reset_state(self):
+        """把占用标记全部置为 False"""
+        self.cols[:] = [False] * self.n
+        self.diag1[:] = [False] * (2 * self.n - 1)
+        self.diag2[:] = [False] * (2 * self.n - 1)
+
+    def is_safe(self, row: int, col: int) -> bool:
+        """检查(row, col)所在的列和两条对角线是否都未被占用"""
+        return not (self.cols[col] or
+                    self.diag1[row - col + self.offset] or
+                    self.diag2[row + col])
+
+    def place_queen(self, row: int, col: int):
+        """放置皇后并置位占用标记"""
+        self.cols[col] = self.diag1[row - col + self.offset] = self.diag2[row + col] = True
+
+    def remove_queen(self, row: int, col: int):
+        """移除皇后并清除占用标记"""
+        self.cols[col] = self.diag1[row - col + self.offset] = self.diag2[row + col] = False
+
+
 def get_valid_input() -> int:
     """
     获取有效的N值输入
@@ -182,7 +221,7 @@ def performance_analysis():
     for n in n_values:
         print(f"测试 N={n}...", end=" ")
 
-        solver = NQueensSolver(n)
+        solver = NQueensArraySolver(n)
         start_time = time.perf_counter()
         solutions, count = solver.solve(find_all=True)
         end_time = time.perf_counter()
@@ -263,7 +302,7 @@ def main():
 
                 print(f"\n开始求解 {n}×{n} 棋盘的N皇后问题...")
 
-                solver = NQueensSolver(n)
+                solver = NQueensArraySolver(n)
                 start_time = time.perf_counter()
                 solutions, count = solver.solve(find_all)
                 end_time = time.perf_counter()
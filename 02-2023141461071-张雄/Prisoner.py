@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']  # 支持中文显示
@@ -8,19 +9,24 @@ plt.rcParams['axes.unicode_minus'] = False  # 正确显示负号
 
 
 class PrisonerSimulator:
-    def __init__(self, n=100, max_attempts=50):
-        """初始化囚徒问题模拟器"""
+    def __init__(self, n=100, max_attempts=50, seed=None):
+        """初始化囚徒问题模拟器，seed 为整数、None 或 numpy.random.SeedSequence"""
         self.n = n  # 囚徒数量
         self.k = max_attempts  # 每个囚徒最多尝试次数
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)  # 本模拟器独立的随机流
 
     def generate_boxes(self):
         """生成随机的盒子排列（0-99的随机排列）"""
-        return np.random.permutation(self.n)
+        return self.rng.permutation(self.n)
 
     def random_strategy(self, boxes, pid):
         """随机搜索策略：随机选择k个盒子"""
         # 随机选择不重复的盒子
-        chosen = np.random.choice(self.n, size=min(self.k, self.n), replace=False)
+        chosen = self.rng.choice(self.n, size=min(self.k, self.n), replace=False)
         for box in chosen:
             if boxes[box] == pid:  # 找到自己的编号
                 return True
@@ -38,44 +44,74 @@ class PrisonerSimulator:
             current = paper  # 跳转到下一个盒子
         return False
 
-    def simulate_round(self, strategy='random'):
-        """模拟单轮实验，返回是否全体成功和成功人数"""
+    def cycle_lengths(self, boxes):
+        """排列中所有循环的长度，每个盒子只访问一次"""
+        return cycle_lengths(boxes)
+
+    def round_stats(self, strategy='random'):
+        """模拟单轮实验，返回成功人数和本轮排列的最长循环长度
+
+        循环策略下，囚徒成功当且仅当他所在的循环长度不超过k，
+        所以成功人数就是所有长度不超过k的循环的长度之和
+        """
         boxes = self.generate_boxes()
-        success_count = 0
-        for pid in range(self.n):
-            if strategy == 'random':
-                success = self.random_strategy(boxes, pid)
-            elif strategy == 'cycle':
-                success = self.cycle_strategy(boxes, pid)
-            else:
-                raise ValueError("策略必须为'random'或'cycle'")
-            if success:
-                success_count += 1
-        all_success = (success_count == self.n)
-        return all_success, success_count
-
-    def run_simulation(self, n_sims=10000, strategy='random', verbose=True):
-        """运行多轮仿真，返回统计结果"""
-        all_success_cnt = 0
-        success_list = []
+        cycles = self.cycle_lengths(boxes)
+        if strategy == 'cycle':
+            success_count = sum(length for length in cycles if length <= self.k)
+        elif strategy == 'random':
+            success_count = sum(self.random_strategy(boxes, pid) for pid in range(self.n))
+        else:
+            raise ValueError("策略必须为'random'或'cycle'")
+        return success_count, max(cycles)
+
+    def run_simulation(self, n_sims=10000, strategy='random', verbose=True, workers=1, chunk_size=1000):
+        """运行多轮仿真，返回统计结果
+
+        n_sims轮按chunk_size切块，每块使用从seed派生的独立随机流；
+        workers大于1时各块交给进程池并行执行，结果与单进程逐位相同。
+        每块只返回成功人数和最长循环长度的直方图，由主进程合并。
+        """
+        sizes = [min(chunk_size, n_sims - start) for start in range(0, n_sims, chunk_size)]
+        streams = self.seed_sequence.spawn(len(sizes))
         if verbose:
             print(f"运行{strategy}策略仿真...")
-        for i in range(n_sims):
-            if verbose and (i + 1) % 1000 == 0:
-                print(f"进度: {i + 1}/{n_sims}")
-            all_success, success_cnt = self.simulate_round(strategy)
-            if all_success:
-                all_success_cnt += 1
-            success_list.append(success_cnt)
-        success_rate = all_success_cnt / n_sims
+
+        success_hist = np.zeros(self.n + 1, dtype=np.int64)  # 成功人数的直方图
+        max_cycle_hist = np.zeros(self.n + 1, dtype=np.int64)  # 最长循环长度的直方图
+        done = 0
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            futures = [executor.submit(simulate_chunk, self.n, self.k, strategy, stream, size)
+                       for size, stream in zip(sizes, streams)]
+            chunks = (future.result() for future in futures)
+        else:
+            executor = None
+            chunks = (simulate_chunk(self.n, self.k, strategy, stream, size)
+                      for size, stream in zip(sizes, streams))
+        try:
+            for chunk in chunks:
+                success_hist += chunk['success_hist']
+                max_cycle_hist += chunk['max_cycle_hist']
+                done += chunk['n_sims']
+                if verbose:
+                    print(f"进度: {done}/{n_sims}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        counts = np.arange(self.n + 1)
+        avg_success = (counts * success_hist).sum() / n_sims
+        std_success = np.sqrt(((counts - avg_success) ** 2 * success_hist).sum() / n_sims)
+        all_success_cnt = int(success_hist[self.n])
         return {
             'strategy': strategy,
             'n_sims': n_sims,
             'all_success': all_success_cnt,
-            'success_rate': success_rate,
-            'success_list': success_list,
-            'avg_success': np.mean(success_list),
-            'std_success': np.std(success_list)
+            'success_rate': all_success_cnt / n_sims,
+            'success_hist': success_hist,
+            'max_cycle_hist': max_cycle_hist,
+            'avg_success': avg_success,
+            'std_success': std_success
         }
 
     def compare_strategies(self, n_sims=10000):
@@ -116,29 +152,100 @@ class PrisonerSimulator:
 
         return res_random, res_cycle
 
-    def analyze_cycles(self, n_samples=1000):
-        """分析循环长度分布，解释循环策略有效性"""
-        cycle_lengths = []
+    def analyze_cycles(self, n_samples=1000, batch_size=200):
+        """分析循环长度分布，解释循环策略有效性
+
+        统计量按批累加到定长计数器中，内存与样本数无关
+        """
+        stats = CycleStats(self.n)
         print(f"分析循环长度分布 (样本数: {n_samples})...")
-        for i in range(n_samples):
-            if (i + 1) % 200 == 0:
-                print(f"进度: {i + 1}/{n_samples}")
-            boxes = self.generate_boxes()
-            visited = [False] * self.n
-            cycles = []
-            for start in range(self.n):
-                if not visited[start]:
-                    length = 0
-                    current = start
-                    while not visited[current]:
-                        visited[current] = True
-                        current = boxes[current]
-                        length += 1
-                    cycles.append(length)
-            # 记录最长循环长度
-            max_length = max(cycles)
-            cycle_lengths.append(max_length)
-        return cycle_lengths
+        for start in range(0, n_samples, batch_size):
+            batch = np.array([self.generate_boxes() for _ in range(min(batch_size, n_samples - start))])
+            stats.update(batch)
+            print(f"进度: {stats.trials}/{n_samples}")
+        return stats
+
+
+def cycle_lengths(boxes):
+    """排列中所有循环的长度，每个盒子只访问一次"""
+    boxes = np.asarray(boxes).tolist()
+    visited = [False] * len(boxes)
+    cycles = []
+    for start in range(len(boxes)):
+        if not visited[start]:
+            length = 0
+            current = start
+            while not visited[current]:
+                visited[current] = True
+                current = boxes[current]
+                length += 1
+            cycles.append(length)
+    return cycles
+
+
+class CycleStats:
+    """循环长度统计量
+
+    与根目录 one_hundred.CycleStats 的构造方式、属性和方法相同，用长度为 N + 1 的计数器按批累加，
+    内存与样本数无关：cycle_length_counts[L] 为长度为 L 的循环个数，
+    max_cycle_counts[L] 为最长循环恰为 L 的排列个数。另外提供最长循环长度的均值、标准差和中位数。
+    """
+
+    def __init__(self, N):
+        self.N = N
+        self.trials = 0  # 已统计的排列数
+        self.cycle_length_counts = np.zeros(N + 1, dtype=np.int64)
+        self.max_cycle_counts = np.zeros(N + 1, dtype=np.int64)
+
+    def update(self, boxes):
+        """累加一批排列（每行一个）的统计量"""
+        batch = [cycle_lengths(row) for row in boxes]
+        self.trials += len(batch)
+        self.cycle_length_counts += np.bincount([length for cycles in batch for length in cycles],
+                                                minlength=self.N + 1)
+        self.max_cycle_counts += np.bincount([max(cycles) for cycles in batch], minlength=self.N + 1)
+        return self
+
+    def merge(self, other):
+        """合并另一份统计量"""
+        self.trials += other.trials
+        self.cycle_length_counts += other.cycle_length_counts
+        self.max_cycle_counts += other.max_cycle_counts
+        return self
+
+    def success_curve(self):
+        """循环策略对每个K = 0..N的成功率，即最长循环 ≤ K 的比例"""
+        return np.cumsum(self.max_cycle_counts) / max(self.trials, 1)
+
+    def max_cycle_mean(self):
+        """最长循环长度的平均值，没有样本时为0"""
+        return (np.arange(self.N + 1) * self.max_cycle_counts).sum() / max(self.trials, 1)
+
+    def max_cycle_std(self):
+        """最长循环长度的标准差，没有样本时为0"""
+        deviation = np.arange(self.N + 1) - self.max_cycle_mean()
+        return np.sqrt((deviation ** 2 * self.max_cycle_counts).sum() / max(self.trials, 1))
+
+    def max_cycle_median(self):
+        """最长循环长度的中位数，与np.median相同：样本数为偶数时取中间两个值的平均；没有样本时为0"""
+        if not self.trials:
+            return 0.0
+        cumulative = np.cumsum(self.max_cycle_counts)
+        lower = np.searchsorted(cumulative, (self.trials + 1) // 2)  # 第 (trials+1)//2 小的值
+        upper = np.searchsorted(cumulative, self.trials // 2 + 1)  # 第 trials//2+1 小的值
+        return float(lower + upper) / 2
+
+
+def simulate_chunk(n, k, strategy, seed_sequence, n_sims):
+    """在一个独立的随机流上模拟n_sims轮，只返回直方图形式的部分统计量（可在工作进程中调用）"""
+    simulator = PrisonerSimulator(n, k, seed_sequence)
+    success_hist = np.zeros(n + 1, dtype=np.int64)
+    max_cycle_hist = np.zeros(n + 1, dtype=np.int64)
+    for _ in range(n_sims):
+        success_count, max_cycle = simulator.round_stats(strategy)
+        success_hist[success_count] += 1
+        max_cycle_hist[max_cycle] += 1
+    return {'n_sims': n_sims, 'success_hist': success_hist, 'max_cycle_hist': max_cycle_hist}
 
 
 def plot_results(res_rand, res_cyc):
@@ -157,9 +264,12 @@ def plot_results(res_rand, res_cyc):
         axs[0, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height()*1.02,
                        f'{rate:.6f}', ha='center', fontweight='bold')
 
-    # 成功人数分布对比
-    axs[0, 1].hist(res_rand['success_list'], bins=50, alpha=0.7, label='随机策略', color='skyblue', density=True)
-    axs[0, 1].hist(res_cyc['success_list'], bins=50, alpha=0.7, label='循环策略', color='lightcoral', density=True)
+    # 成功人数分布对比（直接使用成功人数直方图）
+    counts = np.arange(len(res_rand['success_hist']))
+    axs[0, 1].hist(counts, bins=50, weights=res_rand['success_hist'], alpha=0.7, label='随机策略',
+                   color='skyblue', density=True)
+    axs[0, 1].hist(counts, bins=50, weights=res_cyc['success_hist'], alpha=0.7, label='循环策略',
+                   color='lightcoral', density=True)
     axs[0, 1].set_xlabel('成功囚徒数量')
     axs[0, 1].set_ylabel('概率密度')
     axs[0, 1].set_title('成功囚徒数量分布')
@@ -167,12 +277,10 @@ def plot_results(res_rand, res_cyc):
     axs[0, 1].grid(True, alpha=0.3)
 
     # 累积分布函数
-    rand_sorted = np.sort(res_rand['success_list'])
-    cyc_sorted = np.sort(res_cyc['success_list'])
-    rand_cdf = np.arange(1, len(rand_sorted)+1) / len(rand_sorted)
-    cyc_cdf = np.arange(1, len(cyc_sorted)+1) / len(cyc_sorted)
-    axs[1, 0].plot(rand_sorted, rand_cdf, label='随机策略', color='skyblue', linewidth=2)
-    axs[1, 0].plot(cyc_sorted, cyc_cdf, label='循环策略', color='lightcoral', linewidth=2)
+    rand_cdf = np.cumsum(res_rand['success_hist']) / res_rand['n_sims']
+    cyc_cdf = np.cumsum(res_cyc['success_hist']) / res_cyc['n_sims']
+    axs[1, 0].step(counts, rand_cdf, where='post', label='随机策略', color='skyblue', linewidth=2)
+    axs[1, 0].step(counts, cyc_cdf, where='post', label='循环策略', color='lightcoral', linewidth=2)
     axs[1, 0].set_xlabel('成功囚徒数量')
     axs[1, 0].set_ylabel('累积概率')
     axs[1, 0].set_title('成功囚徒数量累积分布')
@@ -201,13 +309,16 @@ def plot_results(res_rand, res_cyc):
 
 
 def plot_cycle_analysis(simulator):
-    """分析并绘制循环长度分布"""
-    cycle_lengths = simulator.analyze_cycles(n_samples=5000)
+    """分析并绘制循环长度分布，直接使用CycleStats中的计数器"""
+    stats = simulator.analyze_cycles(n_samples=5000)
+    lengths = np.arange(stats.N + 1)
+    success_curve = stats.success_curve()
 
     fig, axs = plt.subplots(1, 2, figsize=(15, 6))
 
     # 循环长度分布直方图
-    axs[0].hist(cycle_lengths, bins=50, alpha=0.7, color='lightgreen', edgecolor='black')
+    axs[0].hist(lengths, bins=50, weights=stats.max_cycle_counts, alpha=0.7, color='lightgreen',
+                edgecolor='black')
     axs[0].axvline(x=50, color='red', linestyle='--', label='临界值 (50)')
     axs[0].set_xlabel('最长循环长度')
     axs[0].set_ylabel('频次')
@@ -216,10 +327,10 @@ def plot_cycle_analysis(simulator):
     axs[0].grid(True, alpha=0.3)
 
     # 成功概率随循环长度的变化
-    success_prob = [np.mean(np.array(cycle_lengths) <= t) for t in range(1, 101)]
-    axs[1].plot(range(1, 101), success_prob, color='darkgreen', linewidth=2)
+    success_prob = success_curve[1:]
+    axs[1].plot(lengths[1:], success_prob, color='darkgreen', linewidth=2)
     axs[1].axvline(x=50, color='red', linestyle='--', label='K=50')
-    actual_rate = np.mean(np.array(cycle_lengths) <= 50)
+    actual_rate = success_curve[50]
     axs[1].axhline(y=actual_rate, color='orange', linestyle=':', label=f'实际成功率≈{actual_rate:.3f}')
     axs[1].set_xlabel('最大尝试次数 K')
     axs[1].set_ylabel('成功概率')
@@ -232,12 +343,12 @@ def plot_cycle_analysis(simulator):
 
     # 打印统计信息
     print(f"\n最长循环长度统计:")
-    print(f"  平均值: {np.mean(cycle_lengths):.2f}")
-    print(f"  中位数: {np.median(cycle_lengths):.2f}")
-    print(f"  标准差: {np.std(cycle_lengths):.2f}")
-    print(f"  最长循环 ≤ 50 的概率: {np.mean(np.array(cycle_lengths) <= 50):.6f}")
+    print(f"  平均值: {stats.max_cycle_mean():.2f}")
+    print(f"  中位数: {stats.max_cycle_median():.2f}")
+    print(f"  标准差: {stats.max_cycle_std():.2f}")
+    print(f"  最长循环 ≤ 50 的概率: {actual_rate:.6f}")
 
-    return cycle_lengths
+    return stats
 
 
 def parameter_analysis():
@@ -253,6 +364,9 @@ def parameter_analysis():
     ]
 
     results = []
+    # 循环策略成功当且仅当最长循环 ≤ K，同一个N只需抽样一次排列，
+    # 由最长循环长度直方图的累积和读出所有K下的成功率
+    cycle_curves = {}
 
     for n, k in test_cases:
         print(f"\n测试参数: N={n}, K={k}")
@@ -260,11 +374,14 @@ def parameter_analysis():
 
         # 减少模拟次数以节省时间
         res_rand = simulator.run_simulation(1000, 'random', verbose=False)
-        res_cyc = simulator.run_simulation(1000, 'cycle', verbose=False)
+        if n not in cycle_curves:
+            res_cyc = simulator.run_simulation(1000, 'cycle', verbose=False)
+            cycle_curves[n] = np.cumsum(res_cyc['max_cycle_hist']) / res_cyc['n_sims']
+        cyc_rate = cycle_curves[n][k]
 
         # 计算改进比例
         if res_rand['success_rate'] > 0:
-            improvement = res_cyc['success_rate'] / res_rand['success_rate']
+            improvement = cyc_rate / res_rand['success_rate']
         else:
             improvement = float('inf')
 
@@ -273,12 +390,12 @@ def parameter_analysis():
             'k': k,
             'k_ratio': k / n,
             'rand_rate': res_rand['success_rate'],
-            'cyc_rate': res_cyc['success_rate'],
+            'cyc_rate': cyc_rate,
             'improvement': improvement
         })
 
         print(f"  随机策略成功率: {res_rand['success_rate']:.6f}")
-        print(f"  循环策略成功率: {res_cyc['success_rate']:.6f}")
+        print(f"  循环策略成功率: {cyc_rate:.6f}")
         if improvement != float('inf'):
             print(f"  改进比例: {improvement:.1f}倍")
         else:
@@ -187,6 +187,46 @@ def simulate_single_round(n: int, k: int, strategy: Strategy) -> bool:
     return True
 
 
+def max_cycle_length(boxes: list[int]) -> int:
+    """
+    盒子排列中最长循环的长度，每个盒子只访问一次
+
+    Args:
+        boxes: 盒子数组，boxes[i]表示第i+1个盒子中的纸条编号
+
+    Returns:
+        int: 最长循环的长度
+    """
+    visited = [False] * len(boxes)
+    longest = 0
+    for start in range(len(boxes)):
+        length = 0
+        current = start
+        while not visited[current]:
+            visited[current] = True
+            length += 1
+            current = boxes[current] - 1  # 转换为0-based索引
+        longest = max(longest, length)
+    return longest
+
+
+def sample_max_cycle_histogram(n: int, trials: int) -> list[int]:
+    """
+    抽样trials个随机排列，统计最长循环长度的直方图
+
+    Args:
+        n: 囚犯数量
+        trials: 抽样次数
+
+    Returns:
+        list[int]: 长度为n+1的列表，第L项为最长循环恰为L的次数
+    """
+    hist = [0] * (n + 1)
+    for _ in range(trials):
+        hist[max_cycle_length(create_random_boxes(n))] += 1
+    return hist
+
+
 def run_simulation(n: int, k: int, trials: int) -> tuple[float, float]:
     """
     运行完整模拟
@@ -214,11 +254,16 @@ def run_simulation(n: int, k: int, trials: int) -> tuple[float, float]:
     return random_successes / trials, loop_successes / trials
 
 
+# 按k缓存的 p(m)，即m个元素的随机排列中所有循环长度都不超过k的概率，m = 0, 1, 2, ...
+_NO_LONG_CYCLE_CACHE: dict[int, list[float]] = {}
+
+
 def calculate_theoretical_success_rate(n: int, k: int) -> float:
     """
     计算循环策略的理论成功率
 
-    基于排列循环理论：成功的条件是所有循环长度都不超过k
+    基于排列循环理论：成功的条件是所有循环长度都不超过k，
+    对任意k给出精确值，结果跨调用缓存
 
     Args:
         n: 囚犯数量
@@ -227,17 +272,16 @@ def calculate_theoretical_success_rate(n: int, k: int) -> float:
     Returns:
         float: 理论成功率
     """
-    # 使用调和级数近似计算
-    # P(成功) ≈ 1 - ln(n/k)，当k=n/2时
     if k >= n:
         return 1.0
-    elif k == n // 2:
-        # 精确计算：P = 1 - H(n) + H(k)，其中H(i)是第i个调和数
-        harmonic_n = sum(1 / i for i in range(k + 1, n + 1))
-        return 1 - harmonic_n
-    else:
-        # 一般情况的近似
-        return max(0, 1 - np.log(n / k))
+    if k <= 0:
+        return 0.0
+    # 元素1所在循环长度为j的概率都是1/m，因此
+    # p(m) = (p(m-1) + ... + p(m-k)) / m，p(0) = 1，自底向上计算，没有递归
+    probs = _NO_LONG_CYCLE_CACHE.setdefault(k, [1.0])
+    for m in range(len(probs), n + 1):
+        probs.append(sum(probs[max(0, m - k):m]) / m)
+    return probs[n]
 
 
 def plot_results(results: dict[str, Any]):
@@ -306,13 +350,15 @@ def plot_results(results: dict[str, Any]):
     plt.show()
 
 
-def plot_parameter_analysis(n: int, max_trials: int = 5000) -> None:
+def plot_parameter_analysis(n: int, max_trials: int = 5000, analytic: bool = False) -> None:
     """
     绘制参数分析图
 
     Args:
         n: 囚犯数量
         max_trials: 最大模拟轮次
+        analytic: 为True时直接使用精确公式，不进行模拟
+            （随机策略的成功率为 (k/n)^n）
     """
 
     # 分析不同k值对成功率的影响
@@ -323,29 +369,32 @@ def plot_parameter_analysis(n: int, max_trials: int = 5000) -> None:
 
     # 创建策略实例
     random_strategy = RandomStrategy()
-    loop_strategy = LoopStrategy()
 
     print("正在进行参数敏感性分析...")
+    if not analytic:
+        # 循环策略成功当且仅当最长循环不超过k，只需抽样一次排列，
+        # 最长循环长度直方图的累积和就是所有k下的成功率
+        max_cycle_hist = sample_max_cycle_histogram(n, max_trials)
+        loop_curve = np.cumsum(max_cycle_hist) / max_trials
     for i, k in enumerate(k_values):
+        theoretical_rate = calculate_theoretical_success_rate(n, k)
+        theoretical_rates.append(theoretical_rate)
+        if analytic:
+            random_rates.append((k / n) ** n)
+            loop_rates.append(theoretical_rate)
+            continue
+
         trials = min(max_trials, max(100, 1000 // max(1, k // 10)))
 
-        # 运行模拟
+        # 运行模拟（随机策略仍需对每个k分别模拟）
         random_successes = 0
-        loop_successes = 0
 
         for _ in range(trials):
             if simulate_single_round(n, k, random_strategy):
                 random_successes += 1
-            if simulate_single_round(n, k, loop_strategy):
-                loop_successes += 1
 
-        random_rate = random_successes / trials
-        loop_rate = loop_successes / trials
-        theoretical_rate = calculate_theoretical_success_rate(n, k)
-
-        random_rates.append(random_rate)
-        loop_rates.append(loop_rate)
-        theoretical_rates.append(theoretical_rate)
+        random_rates.append(random_successes / trials)
+        loop_rates.append(loop_curve[k])
 
     # 绘制结果
     plt.figure(figsize=(10, 6))
@@ -1,13 +1,100 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import time
-import seaborn as sns
-from tqdm import tqdm
 import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# 无界面批处理模式（环境变量 PRISONERS_HEADLESS=1）：不询问参数、不显示进度条，
+# 图像用 Agg 后端只写入文件。matplotlib 和 tqdm 都在真正用到时才导入
+HEADLESS = os.environ.get("PRISONERS_HEADLESS", "") not in ("", "0")
+
+
+def get_pyplot():
+    """第一次绘图时才导入 matplotlib，没有显示器时使用 Agg 后端"""
+    import matplotlib
+    if HEADLESS or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def show_figure(plt):
+    """有显示器时显示图像，否则图像已保存，直接关闭"""
+    if HEADLESS or plt.get_backend().lower() == "agg":
+        plt.close()
+    else:
+        plt.show()
+
+
+def max_cycle_length(perm, limit=None):
+    """
+    排列的最长循环长度，每个元素只访问一次
+
+    参数:
+    perm: 盒子排列
+    limit: 给出时，一旦走到长度超过limit的循环就立即返回limit + 1
+    """
+    if hasattr(perm, 'tolist'):
+        perm = perm.tolist()
+    n = len(perm)
+    visited = bytearray(n)
+    longest = 0
+    for start in range(n):
+        if visited[start]:
+            continue
+        length = 0
+        current = start
+        while not visited[current]:
+            visited[current] = 1
+            length += 1
+            if limit is not None and length > limit:
+                return length
+            current = perm[current]
+        longest = max(longest, length)
+    return longest
+
+
+def no_long_cycle_probability(N, K):
+    """
+    N个元素的随机排列中所有循环长度都不超过K的概率，即循环策略的精确成功率
+
+    囚犯0所在循环的长度取1..N中每个值的概率都是1/N，去掉这个循环后剩下的仍是随机排列，因此
+    p(n) = (p(n-1) + ... + p(n-K)) / n，p(0) = 1，计算量为O(N·K)，没有抽样误差
+    """
+    if K >= N:
+        return 1.0
+    if K <= 0:
+        return 0.0
+    p = [1.0] + [0.0] * N
+    for n in range(1, N + 1):
+        p[n] = sum(p[max(0, n - K):n]) / n
+    return p[N]
+
+
+def simulate_chunk(N, K, seed_sequence, trials):
+    """
+    在一个独立的随机流上模拟trials轮，只返回部分统计量（可在工作进程中调用）
+
+    返回: {'trials', 'random': 随机策略成功次数, 'cycle': 循环策略成功次数,
+           'max_cycle_hist': 最长循环长度直方图}
+    """
+    simulator = PrisonerProblemSimulator(N, K, trials, seed_sequence)
+    random_success = 0
+    cycle_success = 0
+    max_cycle_hist = np.zeros(N + 1, dtype=np.int64)
+    for _ in range(trials):
+        boxes = simulator.generate_boxes()
+        random_success += simulator.random_strategy(boxes)
+        max_cycle = max_cycle_length(boxes)
+        max_cycle_hist[max_cycle] += 1
+        cycle_success += max_cycle <= K
+    return {'trials': trials, 'random': random_success, 'cycle': int(cycle_success),
+            'max_cycle_hist': max_cycle_hist}
 
 
 class PrisonerProblemSimulator:
-    def __init__(self, N=100, K=50, T=10000):
+    def __init__(self, N=100, K=50, T=10000, seed=None):
         """
         初始化囚犯问题模拟器
 
@@ -15,17 +102,23 @@ class PrisonerProblemSimulator:
         N: 囚犯数量 (默认100)
         K: 每人尝试次数 (默认50)
         T: 模拟轮次 (默认10000)
+        seed: 随机种子，整数、None 或 numpy.random.SeedSequence
         """
         self.N = N
         self.K = K
         self.T = T
-        self.results = {'random': [], 'cycle': []}
-        self.cycle_lengths = []
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
         self.success_rates = {'random': 0, 'cycle': 0}
+        self.success_counts = {'random': 0, 'cycle': 0}
+        self.max_cycle_hist = np.zeros(N + 1, dtype=np.int64)  # 每轮排列最长循环长度的直方图
 
     def generate_boxes(self):
         """生成随机排列的盒子"""
-        return np.random.permutation(self.N)
+        return self.rng.permutation(self.N)
 
     def random_strategy(self, boxes):
         """
@@ -36,7 +129,7 @@ class PrisonerProblemSimulator:
         """
         for prisoner in range(self.N):
             # 随机选择K个盒子
-            choices = np.random.choice(self.N, self.K, replace=False)
+            choices = self.rng.choice(self.N, self.K, replace=False)
             # 检查是否找到自己的编号
             if prisoner not in boxes[choices]:
                 return False
@@ -46,89 +139,71 @@ class PrisonerProblemSimulator:
         """
         循环搜索策略
 
-        每个囚犯从自己编号的盒子开始，沿着盒子中的纸条跳转
-        返回: 所有囚犯是否都找到了自己的编号
+        每个囚犯从自己编号的盒子开始，沿着盒子中的纸条跳转，
+        所有人都成功当且仅当排列的最长循环不超过K
+        返回: (所有囚犯是否都找到了自己的编号, 最大循环长度)
         """
-        max_cycle_length = 0
-        visited = np.zeros(self.N, dtype=bool)
-
-        for prisoner in range(self.N):
-            if visited[prisoner]:
-                continue
-
-            current = prisoner
-            cycle_length = 0
-            cycle_found = False
-
-            # 沿着循环寻找
-            for step in range(self.K):
-                visited[current] = True
-                next_box = boxes[current]
+        max_cycle = max_cycle_length(boxes, self.K)
+        if max_cycle > self.K:
+            return False, 0
+        return True, max_cycle
 
-                # 如果找到自己的编号
-                if next_box == prisoner:
-                    cycle_length = step + 1
-                    max_cycle_length = max(max_cycle_length, cycle_length)
-                    cycle_found = True
-                    break
-
-                current = next_box
-
-            # 如果在K步内没找到自己的编号
-            if not cycle_found:
-                return False, 0
-
-        self.cycle_lengths.append(max_cycle_length)
-        return True, max_cycle_length
+    def run_simulation(self, workers=1, chunk_size=1000):
+        """
+        运行模拟
 
-    def run_simulation(self):
-        """运行模拟"""
+        T轮按chunk_size切块，每块使用从seed派生的独立随机流；
+        workers大于1时各块交给进程池并行执行，结果与单进程逐位相同。
+        每块只返回成功次数和最长循环长度直方图，由主进程合并，不逐轮保存结果。
+        每次调用都重新统计，不累加上一次模拟的结果。
+        """
         print(f"开始模拟: N={self.N}, K={self.K}, T={self.T}次")
-
-        # 进度条
-        progress_bar = tqdm(total=self.T, desc="模拟进度")
-
-        for trial in range(self.T):
-            boxes = self.generate_boxes()
-
-            # 随机策略
-            random_result = self.random_strategy(boxes)
-            self.results['random'].append(random_result)
-
-            # 循环策略
-            cycle_result, _ = self.cycle_strategy(boxes)
-            self.results['cycle'].append(cycle_result)
-
-            progress_bar.update(1)
+        self.success_counts = {'random': 0, 'cycle': 0}
+        self.max_cycle_hist = np.zeros(self.N + 1, dtype=np.int64)
+
+        sizes = [min(chunk_size, self.T - start) for start in range(0, self.T, chunk_size)]
+        streams = self.seed_sequence.spawn(len(sizes))
+
+        # 进度条，每完成一块更新一次
+        from tqdm import tqdm
+        progress_bar = tqdm(total=self.T, desc="模拟进度", disable=HEADLESS)
+
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            futures = [executor.submit(simulate_chunk, self.N, self.K, stream, size)
+                       for size, stream in zip(sizes, streams)]
+            chunks = (future.result() for future in futures)
+        else:
+            executor = None
+            chunks = (simulate_chunk(self.N, self.K, stream, size)
+                      for size, stream in zip(sizes, streams))
+        try:
+            for chunk in chunks:
+                self.success_counts['random'] += chunk['random']
+                self.success_counts['cycle'] += chunk['cycle']
+                self.max_cycle_hist += chunk['max_cycle_hist']
+                progress_bar.update(chunk['trials'])
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         progress_bar.close()
 
         # 计算成功率
-        self.success_rates['random'] = np.mean(self.results['random'])
-        self.success_rates['cycle'] = np.mean(self.results['cycle'])
+        self.success_rates['random'] = self.success_counts['random'] / self.T
+        self.success_rates['cycle'] = self.success_counts['cycle'] / self.T
 
         print("\n模拟完成!")
         print(f"随机策略成功率: {self.success_rates['random'] * 100:.4f}%")
         print(f"循环策略成功率: {self.success_rates['cycle'] * 100:.4f}%")
 
     def theoretical_success_rate(self):
-        """计算循环策略的理论成功率"""
-        # 当最大循环长度不超过K时的概率
-        total_prob = 0
-        for L in range(self.K + 1, self.N + 1):
-            # 计算最大循环长度恰好为L的概率
-            prob = 1 / L
-            # 减去更小循环长度的影响
-            for i in range(L, self.N + 1):
-                if i != L:
-                    prob *= (1 - 1 / max(i, L))
-            total_prob += prob
-
-        # 理论成功率为1减去最大循环长度超过K的概率
-        return 1 - total_prob
+        """计算循环策略的理论成功率：最长循环不超过K的精确概率"""
+        return no_long_cycle_probability(self.N, self.K)
 
     def plot_results(self):
         """绘制结果图表"""
+        plt = get_pyplot()
         plt.figure(figsize=(15, 10))
 
         # 成功率对比
@@ -148,7 +223,8 @@ class PrisonerProblemSimulator:
 
         # 循环长度分布
         plt.subplot(2, 2, 2)
-        plt.hist(self.cycle_lengths, bins=range(1, self.N + 1), alpha=0.7, color='orange')
+        plt.hist(np.arange(self.N + 1), bins=range(1, self.N + 1), weights=self.max_cycle_hist,
+                 alpha=0.7, color='orange')
         plt.axvline(x=self.K, color='r', linestyle='--', label=f'K={self.K}')
         plt.xlabel('最大循环长度')
         plt.ylabel('频率')
@@ -157,9 +233,8 @@ class PrisonerProblemSimulator:
 
         # 成功/失败分布
         plt.subplot(2, 2, 3)
-        cycle_results = ['成功' if r else '失败' for r in self.results['cycle']]
-        success_count = sum(1 for r in cycle_results if r == '成功')
-        failure_count = len(cycle_results) - success_count
+        success_count = self.success_counts['cycle']
+        failure_count = self.T - success_count
         plt.pie([success_count, failure_count], labels=['成功', '失败'],
                 autopct='%1.1f%%', colors=['lightgreen', 'lightcoral'])
         plt.title('循环策略成功/失败分布')
@@ -176,7 +251,7 @@ class PrisonerProblemSimulator:
 
         plt.tight_layout()
         plt.savefig('prisoner_problem_results.png')
-        plt.show()
+        show_figure(plt)
 
     def analyze_parameters(self):
         """分析不同参数对成功率的影响"""
@@ -186,25 +261,14 @@ class PrisonerProblemSimulator:
         ratios = [0.3, 0.4, 0.5, 0.6, 0.7]
         N_values = [20, 40, 60, 80, 100]
 
+        # 成功率直接用精确递推计算，不需要再模拟
+        plt = get_pyplot()
         plt.figure(figsize=(15, 6))
 
         # 固定K/N比例
         plt.subplot(1, 2, 1)
         for ratio in ratios:
-            success_rates = []
-            for N in N_values:
-                K = int(N * ratio)
-                # 使用理论公式计算成功率
-                prob = 0
-                for L in range(K + 1, N + 1):
-                    term = 1 / L
-                    for i in range(L, N + 1):
-                        if i != L:
-                            term *= (1 - 1 / max(i, L))
-                    prob += term
-                success_rate = 1 - prob
-                success_rates.append(success_rate)
-
+            success_rates = [no_long_cycle_probability(N, int(N * ratio)) for N in N_values]
             plt.plot(N_values, success_rates, 'o-', label=f'K/N={ratio}')
 
         plt.xlabel('囚犯数量 (N)')
@@ -217,18 +281,7 @@ class PrisonerProblemSimulator:
         plt.subplot(1, 2, 2)
         N_fixed = 100
         K_values = range(30, 81, 10)
-        success_rates_fixed_N = []
-
-        for K in K_values:
-            prob = 0
-            for L in range(K + 1, N_fixed + 1):
-                term = 1 / L
-                for i in range(L, N_fixed + 1):
-                    if i != L:
-                        term *= (1 - 1 / max(i, N_fixed))
-                prob += term
-            success_rate = 1 - prob
-            success_rates_fixed_N.append(success_rate)
+        success_rates_fixed_N = [no_long_cycle_probability(N_fixed, K) for K in K_values]
 
         plt.plot(K_values, success_rates_fixed_N, 's-', color='purple')
         plt.xlabel('尝试次数 (K)')
@@ -238,12 +291,12 @@ class PrisonerProblemSimulator:
 
         plt.tight_layout()
         plt.savefig('parameter_analysis.png')
-        plt.show()
+        show_figure(plt)
 
-    def run(self):
+    def run(self, workers=1):
         """运行完整模拟和分析"""
         start_time = time.time()
-        self.run_simulation()
+        self.run_simulation(workers)
         end_time = time.time()
 
         print(f"\n模拟用时: {end_time - start_time:.2f}秒")
@@ -267,14 +320,17 @@ if __name__ == "__main__":
     print("100囚犯抽签问题仿真分析")
     print("=" * 60)
 
-    # 获取用户输入
-    try:
-        N = int(input("请输入囚犯数量N (默认100): ") or 100)
-        K = int(input(f"请输入每人尝试次数K (默认{int(N / 2)}): ") or int(N / 2))
-        T = int(input("请输入模拟轮次T (默认10000): ") or 10000)
-    except ValueError:
-        print("输入无效，使用默认参数")
+    # 获取用户输入，无界面模式下直接使用默认参数
+    if HEADLESS:
         N, K, T = 100, 50, 10000
+    else:
+        try:
+            N = int(input("请输入囚犯数量N (默认100): ") or 100)
+            K = int(input(f"请输入每人尝试次数K (默认{int(N / 2)}): ") or int(N / 2))
+            T = int(input("请输入模拟轮次T (默认10000): ") or 10000)
+        except ValueError:
+            print("输入无效，使用默认参数")
+            N, K, T = 100, 50, 10000
 
     # 验证参数
     if N < 2:
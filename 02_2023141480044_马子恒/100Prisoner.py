@@ -1,14 +1,26 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 from collections import defaultdict
+import os
+import sys
 import time
 from typing import List, Tuple, Dict
-import seaborn as sns
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+# 无界面批处理模式（环境变量 PRISONERS_HEADLESS=1）：图像用 Agg 后端只写入文件，
+# 不调用阻塞的 plt.show()。matplotlib 在第一次绘图时才导入
+HEADLESS = os.environ.get("PRISONERS_HEADLESS", "") not in ("", "0")
+
+
+def get_pyplot():
+    """导入 matplotlib 并设置中文字体，没有显示器时使用 Agg 后端"""
+    import matplotlib
+    if HEADLESS or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # 设置中文字体
+    plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
 
 
 class PrisonerBoxProblem:
@@ -183,6 +195,7 @@ class PrisonerBoxProblem:
 def plot_results(random_results: Dict, cycle_results: Dict,
                  cycle_lengths: List[int], n_prisoners: int, max_attempts: int):
     """绘制分析结果图表"""
+    plt = get_pyplot()
 
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
 
@@ -245,7 +258,11 @@ def plot_results(random_results: Dict, cycle_results: Dict,
     ax4.legend()
 
     plt.tight_layout()
-    plt.show()
+    plt.savefig('prisoner_results.png')
+    if HEADLESS or plt.get_backend().lower() == "agg":
+        plt.close(fig)
+    else:
+        plt.show()
 
 
 def main():
@@ -1,14 +1,15 @@
 import random
-import matplotlib.pyplot as plt
+import numpy as np
 from collections import Counter
+from one_hundred import exact_success_probability, get_pyplot, max_cycle_length, show_figure
 
-def simulate_strategy_random(N, K):
-    """模拟随机搜索策略"""
+def simulate_strategy_random(N, K, rng=random):
+    """模拟随机搜索策略，rng 为随机数生成器（默认使用全局 random 模块）"""
     boxes = list(range(1, N+1))
-    random.shuffle(boxes)
+    rng.shuffle(boxes)
     
     for prisoner in range(1, N+1):
-        chosen_boxes = random.sample(range(1, N+1), K)
+        chosen_boxes = rng.sample(range(1, N+1), K)
         found = False
         for box in chosen_boxes:
             if boxes[box-1] == prisoner:
@@ -18,29 +19,26 @@ def simulate_strategy_random(N, K):
             return False
     return True
 
-def simulate_strategy_loop(N, K):
-    """模拟循环搜索策略"""
+def simulate_strategy_loop(N, K, rng=random):
+    """模拟循环搜索策略：所有人都成功当且仅当最长循环不超过K"""
     boxes = list(range(1, N+1))
-    random.shuffle(boxes)
+    rng.shuffle(boxes)
     
-    for prisoner in range(1, N+1):
-        current_box = prisoner
-        found = False
-        for _ in range(K):
-            if boxes[current_box-1] == prisoner:
-                found = True
-                break
-            current_box = boxes[current_box-1]
-        if not found:
-            return False
-    return True
+    # 盒子 i 中的纸条指向盒子 boxes[i-1]，换成从0开始的排列
+    perm = [box - 1 for box in boxes]
+    return max_cycle_length(perm, K) <= K
 
-def calculate_theoretical_success_rate(N):
-    """计算循环策略的理论成功率"""
-    return 1 - sum(1/i for i in range(N//2 + 1, N+1))
+def calculate_theoretical_success_rate(N, K=None):
+    """计算循环策略的理论成功率，K 默认为 N//2"""
+    if K is None:
+        K = N // 2
+    return exact_success_probability(N, K)
 
-def run_simulation(N=100, K=50, T=10000):
-    """运行模拟并比较两种策略"""
+def run_simulation(N=100, K=50, T=10000, seed=None):
+    """运行模拟并比较两种策略，两种策略各用一个由 seed 派生的独立随机流"""
+    random_stream, loop_stream = np.random.SeedSequence(seed).spawn(2)
+    random_rng = random.Random(random_stream.generate_state(4).tobytes())
+    loop_rng = random.Random(loop_stream.generate_state(4).tobytes())
     random_success_count = 0
     loop_success_count = 0
     loop_success_distribution = []
@@ -51,12 +49,12 @@ def run_simulation(N=100, K=50, T=10000):
     
     for i in range(T):
         # 策略1：随机搜索
-        random_success = simulate_strategy_random(N, K)
+        random_success = simulate_strategy_random(N, K, random_rng)
         if random_success:
             random_success_count += 1
         
         # 策略2：循环搜索
-        loop_success = simulate_strategy_loop(N, K)
+        loop_success = simulate_strategy_loop(N, K, loop_rng)
         if loop_success:
             loop_success_count += 1
         
@@ -66,7 +64,7 @@ def run_simulation(N=100, K=50, T=10000):
     
     random_success_rate = random_success_count / T
     loop_success_rate = loop_success_count / T
-    theoretical_rate = calculate_theoretical_success_rate(N)
+    theoretical_rate = calculate_theoretical_success_rate(N, K)
     
     # 打印结果
     print(f"\n模拟结果汇总:")
@@ -74,7 +72,8 @@ def run_simulation(N=100, K=50, T=10000):
     print(f"循环搜索策略成功率: {loop_success_rate:.6f} ({loop_success_count}/{T})")
     print(f"理论成功率: {theoretical_rate:.6f}")
     
-    # 可视化循环策略的成功分布
+    # 可视化循环策略的成功分布（matplotlib 在这里才导入）
+    plt = get_pyplot()
     plt.figure(figsize=(10, 6))
     plt.bar(["随机策略", "循环策略", "理论值"], 
             [random_success_rate, loop_success_rate, theoretical_rate],
@@ -83,7 +82,8 @@ def run_simulation(N=100, K=50, T=10000):
     plt.title(f'策略成功率对比 (N={N}, K={K})')
     plt.ylabel('成功率')
     plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.show()
+    plt.savefig('strategy_comparison.png')
+    show_figure(plt)
     
     return random_success_rate, loop_success_rate, theoretical_rate
 
@@ -0,0 +1,164 @@
+"""
+显式栈求解器与递归求解器的对比基准
+
+n_queens.iter_n_queens 用每行一层的数组栈 (cols, diag1, diag2, 剩余候选列的位掩码) 驱动搜索，
+这里把它与几种每行递归一次的实现对比：
+    - recursive bitmask：与 iter_n_queens 完全相同的位运算搜索，只是改成递归，单独衡量栈帧开销
+    - n_queens.solve_n_queens_util：根目录的棋盘递归引擎
+    - 高梦蝶 nqueen.py 的 backtrack
+    - fanshengjie n_queens2.py 的 backtrack_with_heuristic
+先核对各实现给出的解（含顺序）完全一致，再比较全部解和第一个解的耗时。
+最后在很大的 N 上固定除最后几行外的前缀，从第 0 行开始搜索：
+递归实现在约 1000 层时抛出 RecursionError，显式栈实现不受影响。
+
+用法: python bench_iterative.py [--sizes 4-10] [--single-sizes 8,16,20,24] [--deep 1000,5000]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import n_queens  # noqa: E402
+from bench_n_queens import parse_sizes  # noqa: E402
+
+GAO_MENGDIE = os.path.join(ROOT, "01_2023141490367_高梦蝶", "N皇后", "nqueen.py")
+FANSHENGJIE = os.path.join(ROOT, "01-2023141470277-fanshengjie", "n_queens2.py")
+
+# 大 N 测试中留给搜索的末尾行数
+DEEP_FREE_ROWS = 10
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def recursive_n_queens(n, prefix=(), limit=None):
+    """与 iter_n_queens 相同的搜索顺序，但每行递归一次；前缀从第 0 行开始逐行放置"""
+    full = (1 << n) - 1
+    queens = [0] * n
+    solutions = []
+
+    def place(row, cols, diag1, diag2):
+        if row == n:
+            solutions.append(tuple(queens))
+            return limit is not None and len(solutions) >= limit
+        available = full & ~(cols | diag1 | diag2)
+        if row < len(prefix):
+            available &= 1 << prefix[row]
+        while available:
+            pos = available & -available
+            available ^= pos
+            queens[row] = pos.bit_length() - 1
+            if place(row + 1, cols | pos, ((diag1 | pos) << 1) & full, (diag2 | pos) >> 1):
+                return True
+        return False
+
+    place(0, 0, 0, 0)
+    return solutions
+
+
+def iterative_n_queens(n, prefix=(), limit=None):
+    solutions = []
+    for queens in n_queens.iter_n_queens(n, prefix):
+        solutions.append(queens)
+        if limit is not None and len(solutions) >= limit:
+            break
+    return solutions
+
+
+def solvers():
+    """[(名称, solve(n, single) -> 列元组列表)]，第一个是作为基准的显式栈实现"""
+    gao = load_module("gao_mengdie_nqueen", GAO_MENGDIE)
+    fan = load_module("fanshengjie_n_queens2", FANSHENGJIE)
+
+    def board_engine(n, single):
+        boards, _ = n_queens.solve_n_queens(n, single, engine="board")
+        return [tuple(row.index(1) for row in board) for board in boards]
+
+    def heuristic(n, single):
+        solver = fan.NQueensSolver()
+        solver.solve_heuristic(n)  # 没有单解模式，总是枚举全部解
+        solutions = [tuple(queens) for queens in solver.solutions]
+        return solutions[:1] if single else solutions
+
+    return [
+        ("iter_n_queens (explicit stack)", lambda n, single: iterative_n_queens(n, limit=1 if single else None)),
+        ("recursive bitmask", lambda n, single: recursive_n_queens(n, limit=1 if single else None)),
+        ("n_queens.solve_n_queens_util", board_engine),
+        ("高梦蝶 backtrack", lambda n, single: [tuple(q) for q in gao.solve_n_queens(n, not single)]),
+        ("fanshengjie backtrack_with_heuristic", heuristic),
+    ]
+
+
+def measure(solve, n, single, repeat):
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = solve(n, single)
+            timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def compare(sizes, single, repeat, skip=()):
+    mode = "first solution" if single else "all solutions"
+    print(f"\n{mode}: median of {repeat} (ratio to iter_n_queens)")
+    entries = [(name, solve) for name, solve in solvers() if name not in skip]
+    print(f"{'N':>3} " + " ".join(f"{name[:24]:>26s}" for name, _ in entries))
+    for n in sizes:
+        expected, base = measure(entries[0][1], n, single, repeat)
+        cells = [f"{base * 1000:11.3f}ms        "]
+        for name, solve in entries[1:]:
+            result, elapsed = measure(solve, n, single, repeat)
+            if result != expected:
+                raise AssertionError(f"{name} 在 N={n} 时的解与 iter_n_queens 不一致")
+            cells.append(f"{elapsed * 1000:11.3f}ms ({elapsed / base:4.2f}x)")
+        print(f"{n:>3} " + " ".join(f"{cell:>26s}" for cell in cells))
+
+
+def deep(sizes):
+    print(f"\nlarge N: prefix fixed except the last {DEEP_FREE_ROWS} rows, "
+          f"recursion limit {sys.getrecursionlimit()}")
+    for n in sizes:
+        prefix = n_queens.constructive_n_queens(n)[:-DEEP_FREE_ROWS]
+        start = time.perf_counter()
+        queens, = iterative_n_queens(n, prefix, limit=1)
+        elapsed = time.perf_counter() - start
+        assert n_queens.is_valid_solution(queens, n)
+        try:
+            recursive = recursive_n_queens(n, prefix, limit=1)
+            outcome = "same solution" if recursive == [queens] else "DIFFERENT solution"
+        except RecursionError:
+            outcome = "RecursionError"
+        print(f"N={n:>5}  iter_n_queens {elapsed * 1000:8.1f}ms (valid)   recursive bitmask: {outcome}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Explicit-stack vs recursive N-Queens solvers")
+    parser.add_argument("--sizes", default="4-10", help="sizes for the all-solutions comparison")
+    parser.add_argument("--single-sizes", default="8,16,20,24", help="sizes for the first-solution comparison")
+    parser.add_argument("--deep", default="1000,5000", help="large sizes for the recursion-depth check")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per size")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+    compare(parse_sizes(args.sizes), False, args.repeat)
+    # fanshengjie 的实现没有单解模式，比较第一个解时不计入
+    compare(parse_sizes(args.single_sizes), True, args.repeat, skip={"fanshengjie backtrack_with_heuristic"})
+    deep(parse_sizes(args.deep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+N 皇后求解器统一基准
+
+自动在根目录的 n_queens.py 和各个 01_* 作业目录中查找求解入口（名字以 solve/count/total 开头
+并且与 queens 相关的函数，以及求解器类上以 solve/count/total 开头的方法），用 N=6、8 的已知解数
+筛出“返回全部解或解数”的入口，再对每个 N 记录：
+    - 解数是否与已知值一致
+    - 多次 perf_counter 计时的中位数、最小值、最大值和标准差
+    - 求解过程中进入该文件内 Python 函数的次数（搜索节点数的通用近似）
+    - tracemalloc 统计的峰值内存
+    - 可统计的回溯实现（见 search_stats.py）另外记录节点、回溯次数及各深度的分支数和剪枝率
+每个文件在独立的子进程中测量（标准输入为空、工作目录为临时目录），
+作业代码的输入提示、打印和写文件都不会影响基准本身。
+
+用法:
+    python bench_n_queens.py --sizes 4-10 --repeat 5 --output report.json
+    python bench_n_queens.py --baseline old_report.json --output new_report.json
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib.util
+import inspect
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from search_stats import SearchStats
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# OEIS A000170
+KNOWN_COUNTS = {1: 1, 2: 0, 3: 0, 4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724,
+                11: 2680, 12: 14200, 13: 73712, 14: 365596, 15: 2279184, 16: 14772512}
+PROBE_SIZES = (6, 8)
+ENTRY_NAME = re.compile(r"^(solve|count|total)", re.IGNORECASE)
+QUEENS_NAME = re.compile(r"queen|solution", re.IGNORECASE)
+
+# 慢于基线这么多倍时标记为退化
+REGRESSION_RATIO = 1.25
+
+
+def discover_files(root=ROOT):
+    """根目录的 n_queens.py 以及 01_* 作业目录下除测试、基准外的所有 .py 文件"""
+    files = [os.path.join(root, "n_queens.py")]
+    for path in sorted(glob.glob(os.path.join(root, "01*", "**", "*.py"), recursive=True)):
+        name = os.path.basename(path)
+        if name.startswith(("test", "bench")) or name in ("time.py", "utils.py"):
+            continue
+        files.append(path)
+    return files
+
+
+def solution_count(result, owner=None):
+    """把各实现五花八门的返回值统一成解数，无法识别时返回 None"""
+    if isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, tuple):
+        numbers = [x for x in result if isinstance(x, int) and not isinstance(x, bool)]
+        if numbers:
+            return numbers[-1]
+        sized = [x for x in result if isinstance(x, (list, set))]
+        return len(sized[0]) if sized else None
+    if isinstance(result, (list, set)):
+        return len(result)
+    if owner is not None and (result is None or isinstance(result, float)):
+        # 有的求解器只返回耗时，把解存在实例属性里
+        for attribute in ("solutions", "solution_count", "count", "total_solutions"):
+            value = getattr(owner, attribute, None)
+            if isinstance(value, (list, set)) and value:
+                return len(value)
+            if isinstance(value, int) and not isinstance(value, bool) and value:
+                return value
+    return None
+
+
+def required_arguments(func):
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    return sum(1 for p in parameters
+               if p.default is p.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location("bench_target", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    spec.loader.exec_module(module)
+    return module
+
+
+def candidate_entries(module):
+    """返回 [(名称, make_call)]，make_call(n) 返回一个无参可调用对象及其所属实例"""
+    entries = []
+    for name, obj in vars(module).items():
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue
+        if inspect.isfunction(obj) and ENTRY_NAME.match(name) and QUEENS_NAME.search(name):
+            if required_arguments(obj) == 1:
+                entries.append((name, lambda n, f=obj: (lambda: f(n), None)))
+                # 带 engine 参数的入口对模块 ENGINES 中的每个引擎各测一次
+                if "engine" in inspect.signature(obj).parameters:
+                    for engine in getattr(module, "ENGINES", ()):
+                        entries.append((f"{name}[{engine}]",
+                                        lambda n, f=obj, e=engine: (lambda: f(n, engine=e), None)))
+        elif inspect.isclass(obj):
+            init_args = required_arguments(obj)
+            if init_args not in (0, 1):
+                continue
+            # 子类继承的求解方法也算入口（例如只替换了状态实现的子类）
+            methods = {}
+            for base in reversed(obj.__mro__):
+                if base.__module__ == module.__name__:
+                    methods.update(vars(base))
+            for method_name, method in methods.items():
+                if not (inspect.isfunction(method) and ENTRY_NAME.match(method_name)):
+                    continue
+                method_args = required_arguments(method) - 1
+                if init_args + method_args != 1:
+                    continue
+
+                def make_call(n, cls=obj, method_name=method_name, pass_to_init=init_args == 1):
+                    instance = cls(n) if pass_to_init else cls()
+                    bound = getattr(instance, method_name)
+                    return (bound if pass_to_init else lambda: bound(n)), instance
+
+                entries.append((f"{name}.{method_name}", make_call))
+    return entries
+
+
+def run_once(make_call, n):
+    call, owner = make_call(n)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+    return solution_count(result, owner), elapsed
+
+
+def count_calls(make_call, n, filename):
+    """求解过程中进入 filename 内 Python 函数的次数"""
+    calls = 0
+
+    def profiler(frame, event, arg):
+        nonlocal calls
+        if event == "call" and frame.f_code.co_filename == filename:
+            calls += 1
+
+    call, _ = make_call(n)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sys.setprofile(profiler)
+        try:
+            call()
+        finally:
+            sys.setprofile(None)
+    return calls
+
+
+def peak_memory(make_call, n):
+    call, _ = make_call(n)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        try:
+            call()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def search_stats(make_call, n, module):
+    """实例上有 backtrack/is_safe/place_queen/remove_queen，或模块里有 solve_n_queens_util/is_safe 时
+    统计一次搜索过程；没有可统计的实现或搜索没有经过这些函数时返回 None"""
+    call, owner = make_call(n)
+    stats = SearchStats()
+    if owner is not None and all(hasattr(owner, name) for name in
+                                 ("backtrack", "is_safe", "place_queen", "remove_queen")):
+        attached = stats.attach(owner)
+    elif hasattr(module, "solve_n_queens_util") and hasattr(module, "is_safe"):
+        attached = stats.attach_module(module)
+    else:
+        return None
+    with attached, contextlib.redirect_stdout(io.StringIO()):
+        call()
+    summary = stats.summary()
+    return summary if summary["nodes"] else None
+
+
+def benchmark_file(path, sizes, repeat, time_budget):
+    """在当前进程中测量一个文件里的全部入口（由 worker 子进程调用）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = load_module(path)
+    filename = os.path.abspath(path)
+    results = []
+    for name, make_call in candidate_entries(module):
+        entry = {"entry": f"{os.path.relpath(path, ROOT)}:{name}", "sizes": {}}
+        try:
+            probe = {n: run_once(make_call, n)[0] for n in PROBE_SIZES}
+        except Exception as exc:  # 作业代码抛出什么异常都只记录下来
+            entry.update(status="error", detail=f"{type(exc).__name__}: {exc}")
+            results.append(entry)
+            continue
+        if any(probe[n] != KNOWN_COUNTS[n] for n in PROBE_SIZES):
+            entry.update(status="skipped", detail=f"not an all-solutions entry point, probe={probe}")
+            results.append(entry)
+            continue
+
+        entry["status"] = "ok"
+        spent = 0.0
+        for n in sizes:
+            if spent > time_budget:
+                entry["sizes"][str(n)] = {"skipped": "time budget exhausted"}
+                continue
+            try:
+                timings = []
+                for _ in range(repeat):
+                    count, elapsed = run_once(make_call, n)
+                    timings.append(elapsed)
+                    spent += elapsed
+                record = {
+                    "count": count,
+                    "expected": KNOWN_COUNTS.get(n),
+                    "median_s": statistics.median(timings),
+                    "min_s": min(timings),
+                    "max_s": max(timings),
+                    "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                    "calls": count_calls(make_call, n, filename),
+                    "peak_bytes": peak_memory(make_call, n),
+                }
+                search = search_stats(make_call, n, module)
+                if search is not None:
+                    record["search"] = search
+            except Exception as exc:
+                record = {"error": f"{type(exc).__name__}: {exc}"}
+            else:
+                if record["expected"] is not None and count != record["expected"]:
+                    entry["status"] = "wrong-count"
+            entry["sizes"][str(n)] = record
+        results.append(entry)
+    return results
+
+
+def run_worker(path, sizes, repeat, time_budget, timeout):
+    """在子进程中测量一个文件，超时或导入失败时返回一条错误记录"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--worker", path, "--worker-output", output,
+                   "--sizes", ",".join(map(str, sizes)), "--repeat", str(repeat),
+                   "--time-budget", str(time_budget)]
+        env = dict(os.environ, MPLBACKEND="Agg", PRISONERS_HEADLESS="1")
+        relpath = os.path.relpath(path, ROOT)
+        try:
+            completed = subprocess.run(command, cwd=tmp, env=env, stdin=subprocess.DEVNULL,
+                                       capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return [{"entry": relpath, "status": "timeout", "sizes": {}}]
+        if completed.returncode != 0 or not os.path.exists(output):
+            lines = completed.stderr.strip().splitlines()
+            return [{"entry": relpath, "status": "error", "sizes": {},
+                     "detail": lines[-1] if lines else f"exit code {completed.returncode}"}]
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def compare(report, baseline, threshold=REGRESSION_RATIO):
+    """按 (入口, N) 比较中位数耗时，返回 [{entry, n, baseline_s, current_s, ratio, regression}]
+
+    只有中位数慢了 threshold 倍以上、并且这次的最小值仍高于基线的最大值时才算退化，
+    避免把计时抖动当成退化。
+    """
+    previous = {(entry["entry"], n): record
+                for entry in baseline["results"] for n, record in entry["sizes"].items()}
+    rows = []
+    for entry in report["results"]:
+        for n, record in entry["sizes"].items():
+            before = previous.get((entry["entry"], n), {})
+            if not before.get("median_s") or "median_s" not in record:
+                continue
+            ratio = record["median_s"] / before["median_s"]
+            rows.append({"entry": entry["entry"], "n": int(n), "baseline_s": before["median_s"],
+                         "current_s": record["median_s"], "ratio": ratio,
+                         "regression": ratio > threshold and record["min_s"] > before["max_s"]})
+    return rows
+
+
+def parse_sizes(text):
+    """"4-10" 或 "4,6,8" """
+    sizes = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = map(int, part.split("-"))
+            sizes.extend(range(low, high + 1))
+        else:
+            sizes.append(int(part))
+    return sizes
+
+
+def print_report(report):
+    for entry in report["results"]:
+        if entry["status"] not in ("ok", "wrong-count"):
+            continue
+        print(f"{entry['entry']}  [{entry['status']}]")
+        for n, record in entry["sizes"].items():
+            if "median_s" not in record:
+                print(f"  N={n:>2}  {record.get('error') or record.get('skipped')}")
+                continue
+            print(f"  N={n:>2}  count={record['count']:<8} median={record['median_s'] * 1000:9.3f}ms "
+                  f"[{record['min_s'] * 1000:.3f}, {record['max_s'] * 1000:.3f}]  "
+                  f"calls={record['calls']:<9} peak={record['peak_bytes'] / 1024:.1f}KiB")
+            if "search" in record:
+                search = record["search"]
+                print(f"        nodes={search['nodes']} backtracks={search['backtracks']} "
+                      f"prune_rate={search['prune_rate']:.1%}")
+    failed = [entry for entry in report["results"] if entry["status"] in ("error", "timeout")]
+    if failed:
+        print(f"\n{len(failed)} 个文件或入口无法测量（详见 JSON 报告）")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="N-Queens solver benchmark")
+    parser.add_argument("--sizes", default="4-10", help='board sizes, e.g. "4-10" or "6,8,10"')
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per size")
+    parser.add_argument("--time-budget", type=float, default=20.0,
+                        help="seconds of timed runs per entry point before larger sizes are skipped")
+    parser.add_argument("--timeout", type=float, default=600.0, help="wall-clock limit per file")
+    parser.add_argument("--files", nargs="*", help="benchmark only these files instead of discovering")
+    parser.add_argument("--output", default="n_queens_benchmark.json", help="JSON report path")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    sizes = parse_sizes(args.sizes)
+
+    if args.worker:
+        results = benchmark_file(args.worker, sizes, args.repeat, args.time_budget)
+        with open(args.worker_output, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        return
+
+    files = [os.path.abspath(path) for path in args.files] if args.files else discover_files()
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for path in files:
+        print(f"benchmarking {os.path.relpath(path, ROOT)} ...", file=sys.stderr)
+        report["results"].extend(run_worker(path, sizes, args.repeat, args.time_budget, args.timeout))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_report(report)
+    for row in report.get("comparison", []):
+        mark = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['entry']} N={row['n']}: {row['baseline_s'] * 1000:.3f}ms -> "
+              f"{row['current_s'] * 1000:.3f}ms ({row['ratio']:.2f}x){mark}")
+    print(f"\nreport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+冷启动时间基准：在新的解释器进程中导入各个模拟脚本，与只导入 numpy 的时间对比
+
+用法: python bench_startup.py [--repeat 7]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# (名称, 文件路径)；文件名不是合法模块名，统一按路径加载，不执行 __main__ 部分
+TARGETS = [
+    ("one_hundred.py", "one_hundred.py"),
+    ("100prisoners.py", "100prisoners.py"),
+    ("Zhaoweiyi/prisoner_problem.py", os.path.join("02_2023141461101_Zhaoweiyi", "prisoner_problem.py")),
+    ("马子恒/100Prisoner.py", os.path.join("02_2023141480044_马子恒", "100Prisoner.py")),
+]
+
+LOAD_TEMPLATE = """
+import importlib.util, sys
+sys.path.insert(0, {root!r})
+spec = importlib.util.spec_from_file_location("bench_target", {path!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+assert "matplotlib" not in sys.modules, "matplotlib imported at module load"
+"""
+
+
+def time_startup(code, repeat):
+    """在 repeat 个新进程中执行 code，返回每次的墙钟时间（秒）"""
+    env = dict(os.environ, PRISONERS_HEADLESS="1")
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the prisoner scripts")
+    parser.add_argument("--repeat", type=int, default=7, help="fresh interpreters per target")
+    args = parser.parse_args(argv)
+
+    cases = [("python (empty)", "pass"),
+             ("import numpy", "import numpy"),
+             ("numpy + matplotlib.pyplot", "import numpy, matplotlib.pyplot")]
+    cases += [(name, LOAD_TEMPLATE.format(root=ROOT, path=os.path.join(ROOT, path)))
+              for name, path in TARGETS]
+
+    print(f"{'target':<32s} {'median':>9s} {'min':>9s} {'max':>9s}")
+    for name, code in cases:
+        timings = time_startup(code, args.repeat)
+        print(f"{name:<32s} {statistics.median(timings) * 1000:7.1f}ms "
+              f"{min(timings) * 1000:7.1f}ms {max(timings) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,15 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from n_queens_store import ResultStore
+from search_stats import SearchStats
+
 
 def is_safe(board, row, col, n):
     # 检查当前列是否有其他皇后
@@ -32,18 +44,459 @@ def solve_n_queens_util(board, row, n, solutions, single_solution=False):
             if solve_n_queens_util(board, row + 1, n, solutions, single_solution):
                 res = True
             board[row][i] = 0  # 移除皇后（回溯）
+            if res and single_solution:
+                break  # 只需要一个解，找到后不再尝试本行其余的列
 
     return res
 
-def solve_n_queens(n, single_solution=False):
+def count_n_queens_util(full, cols, diag1, diag2):
+    # 只计数不记录解，递归深度为 N，额外内存为 O(N)
+    if cols == full:
+        return 1
+
+    count = 0
+    available = full & ~(cols | diag1 | diag2)
+    while available:
+        pos = available & -available
+        available ^= pos
+        count += count_n_queens_util(full, cols | pos, (diag1 | pos) << 1, (diag2 | pos) >> 1)
+    return count
+
+def count_n_queens(n):
+    # 统计N皇后问题的解数，不构造任何棋盘
+    if n < 4:
+        print("N必须至少为4")
+        return 0
+    return count_n_queens_util((1 << n) - 1, 0, 0, 0)
+
+def prefix_state(n, prefix):
+    # 按前几行已放置的列计算位棋盘状态 (cols, diag1, diag2)，前缀自身冲突时返回 None
+    full = (1 << n) - 1
+    cols = diag1 = diag2 = 0
+    for col in prefix:
+        if not 0 <= col < n:
+            return None
+        pos = 1 << col
+        if (cols | diag1 | diag2) & pos:
+            return None
+        cols |= pos
+        diag1 = ((diag1 | pos) << 1) & full
+        diag2 = (diag2 | pos) >> 1
+    return cols, diag1, diag2
+
+def iter_n_queens(n, prefix=()):
+    # 惰性地逐个产出解，每个解是“每行皇后所在列”的元组
+    # 用显式栈代替递归，任意时刻只保存当前搜索路径，内存为 O(N)
+    # 栈的第 r 层是 (cols, diag1, diag2, available)，available 为本行尚未尝试的候选列的位掩码；
+    # 搜索深度不受解释器递归层数限制，每个节点也不创建新的栈帧
+    # prefix 给出前几行已固定的列，只枚举以它开头的解
+    if n < 4:
+        print("N必须至少为4")
+        return
+
+    state = prefix_state(n, prefix)
+    if state is None:
+        return
+    start = len(prefix)
+    if start == n:
+        yield tuple(prefix)
+        return
+
+    full = (1 << n) - 1
+    queens = list(prefix) + [0] * (n - start)
+    cols = [0] * n
+    diag1 = [0] * n
+    diag2 = [0] * n
+    available = [0] * n
+    cols[start], diag1[start], diag2[start] = state
+    available[start] = full & ~(state[0] | state[1] | state[2])
+    row = start
+    while row >= start:
+        avail = available[row]
+        if not avail:
+            row -= 1  # 本行已无可选位置，回溯
+            continue
+        pos = avail & -avail
+        available[row] = avail ^ pos
+        queens[row] = pos.bit_length() - 1
+        if row == n - 1:
+            yield tuple(queens)
+            continue
+        c = cols[row] | pos
+        d1 = ((diag1[row] | pos) << 1) & full
+        d2 = (diag2[row] | pos) >> 1
+        row += 1
+        cols[row], diag1[row], diag2[row] = c, d1, d2
+        available[row] = full & ~(c | d1 | d2)
+
+def symmetric_images(queens):
+    # 解在棋盘的 8 种旋转/翻转下的像（二面体群 D4），都用列元组表示
+    n = len(queens)
+    last = n - 1
+    rot90 = [0] * n
+    for row, col in enumerate(queens):
+        rot90[col] = last - row
+    rot90 = tuple(rot90)
+    rot180 = tuple(last - col for col in reversed(queens))
+    rot270 = tuple(last - col for col in reversed(rot90))
+    images = []
+    for image in (tuple(queens), rot90, rot180, rot270):
+        images.append(image)
+        images.append(tuple(last - col for col in image))  # 左右翻转
+    return images
+
+def canonical_orbit_size(queens):
+    # 若解是所在对称类的代表（8 个像中字典序最小者），返回该类的解数 1/2/4/8，否则返回 0
+    # 先只比较各像的第一个元素：它们分别来自第一行、最后一行、第一列、最后一列的皇后位置
+    last = len(queens) - 1
+    col = queens[0]
+    first_col = queens.index(0)
+    last_col = queens.index(last)
+    lowest = min(last - col, queens[last], last - queens[last],
+                 first_col, last - first_col, last_col, last - last_col)
+    if col > lowest:
+        return 0
+    if col < lowest:
+        return 8  # 其余像都不可能与自身相同
+    images = symmetric_images(queens)
+    if tuple(queens) != min(images):
+        return 0
+    return len(set(images))
+
+def iter_fundamental_n_queens(n):
+    # 只产出每个对称类的代表解及该类的解数
+    # 代表解第一行的皇后一定在左半边（奇数N时可能在正中），所以只搜索这些前缀
+    if n < 4:
+        print("N必须至少为4")
+        return
+
+    for col in range((n + 1) // 2):
+        for queens in iter_n_queens(n, (col,)):
+            orbit_size = canonical_orbit_size(queens)
+            if orbit_size:
+                yield queens, orbit_size
+
+def count_fundamental_util(full, row, cols, diag1, diag2, queens, counts):
+    # 与 count_n_queens_util 相同的递归，只在叶子处判断是否为代表解
+    if cols == full:
+        orbit_size = canonical_orbit_size(queens)
+        if orbit_size:
+            counts[0] += 1
+            counts[1] += orbit_size
+        return
+
+    available = full & ~(cols | diag1 | diag2)
+    while available:
+        pos = available & -available
+        available ^= pos
+        queens[row] = pos.bit_length() - 1
+        count_fundamental_util(full, row + 1, cols | pos, (diag1 | pos) << 1,
+                               (diag2 | pos) >> 1, queens, counts)
+
+def count_n_queens_symmetric(n):
+    # 返回 (基本解个数, 全部解个数)，全部解由各对称类的大小累加得到
+    # 只搜索第一行的左半边（奇数N另加正中一列），约为完整计数一半的搜索量
+    if n < 4:
+        print("N必须至少为4")
+        return 0, 0
+
+    full = (1 << n) - 1
+    queens = [0] * n
+    counts = [0, 0]
+    for col in range((n + 1) // 2):
+        pos = 1 << col
+        queens[0] = col
+        count_fundamental_util(full, 1, pos, pos << 1, pos >> 1, queens, counts)
+    return counts[0], counts[1]
+
+def n_queens_prefixes(n, depth):
+    # 前 depth 行所有互不冲突的放法，按字典序排列；每个前缀对应一棵独立的子树
+    full = (1 << n) - 1
+    prefixes = []
+
+    def extend(prefix, cols, diag1, diag2):
+        if len(prefix) == depth:
+            prefixes.append(tuple(prefix))
+            return
+        available = full & ~(cols | diag1 | diag2)
+        while available:
+            pos = available & -available
+            available ^= pos
+            prefix.append(pos.bit_length() - 1)
+            extend(prefix, cols | pos, ((diag1 | pos) << 1) & full, (diag2 | pos) >> 1)
+            prefix.pop()
+
+    extend([], 0, 0, 0)
+    return prefixes
+
+def count_prefix_chunk(n, prefixes):
+    # 工作进程：统计一组前缀下的解数
+    full = (1 << n) - 1
+    total = 0
+    for prefix in prefixes:
+        state = prefix_state(n, prefix)
+        if state is not None:
+            total += count_n_queens_util(full, *state)
+    return total
+
+def solve_prefix_chunk(n, prefixes):
+    # 工作进程：枚举一组前缀下的全部解
+    solutions = []
+    for prefix in prefixes:
+        solutions.extend(iter_n_queens(n, prefix))
+    return solutions
+
+def solve_n_queens_parallel(n, workers=None, prefix_depth=2, count_only=False):
+    # 按前 prefix_depth 行的放法把搜索树切成互相独立的子树，交给进程池求解
+    # 子树切成比进程数多得多的小块，先做完的进程会继续领取剩下的块，负载保持均衡
+    # 返回值与 solve_n_queens 相同：(N×N 棋盘列表, 解数)；count_only 时棋盘列表为空
+    # 工作进程只传回列元组，主进程按与串行版本相同的顺序合并后再还原成棋盘
+    if n < 4:
+        print("N必须至少为4")
+        return [], 0
+
+    workers = workers or os.cpu_count() or 1
+    prefixes = n_queens_prefixes(n, min(prefix_depth, n))
+    chunk_size = max(1, len(prefixes) // (workers * 8))
+    chunks = [prefixes[i:i + chunk_size] for i in range(0, len(prefixes), chunk_size)]
+    task = count_prefix_chunk if count_only else solve_prefix_chunk
+
+    if workers == 1:
+        results = [task(n, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(task, n, chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+
+    if count_only:
+        return [], sum(results)
+    solutions = [board_from_columns(queens, n) for chunk_solutions in results for queens in chunk_solutions]
+    return solutions, len(solutions)
+
+def load_checkpoint(path, n, prefix_depth):
+    # 读取检查点，返回 {前缀: 该子树的解数}；文件不存在时返回空字典
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if (state.get("n"), state.get("prefix_depth"), state.get("version")) != (n, prefix_depth, ENGINE_VERSION):
+        raise ValueError(f"检查点 {path} 属于 N={state.get('n')}、前缀深度 {state.get('prefix_depth')}、"
+                         f"求解器版本 {state.get('version')} 的任务，与当前任务不符")
+    return {tuple(prefix): count for prefix, count in state["done"]}
+
+def write_json_atomic(path, data):
+    # 先写同目录下的临时文件再 os.replace，中途被杀也不会留下半个文件
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def save_checkpoint(path, n, prefix_depth, total_prefixes, done):
+    # 原子地写入检查点
+    state = {
+        "n": n,
+        "prefix_depth": prefix_depth,
+        "version": ENGINE_VERSION,
+        "prefixes": total_prefixes,
+        "partial_count": sum(done.values()),
+        "done": [[list(prefix), count] for prefix, count in sorted(done.items())],
+    }
+    write_json_atomic(path, state)
+
+def count_n_queens_checkpointed(n, path, resume=False, workers=None, prefix_depth=2, interval=60.0):
+    # 按前 prefix_depth 行的放法逐棵子树计数，每隔 interval 秒把已完成的前缀及其解数写入检查点
+    # resume 时跳过检查点中已完成的前缀；正常结束、出错或被 Ctrl-C 中断时也会写一次检查点
+    # 每棵子树的解数是确定的，中断后续算与一次算完的总数完全相同
+    if n < 4:
+        print("N必须至少为4")
+        return 0
+    if os.path.exists(path) and not resume:
+        raise FileExistsError(f"检查点 {path} 已存在；要从它继续计数请指定 resume（命令行为 --resume）")
+
+    prefix_depth = min(prefix_depth, n)
+    prefixes = n_queens_prefixes(n, prefix_depth)
+    done = load_checkpoint(path, n, prefix_depth) if resume else {}
+    pending = [prefix for prefix in prefixes if prefix not in done]
+    last_save = time.monotonic()
+
+    def record(prefix, count):
+        nonlocal last_save
+        done[prefix] = count
+        if time.monotonic() - last_save >= interval:
+            save_checkpoint(path, n, prefix_depth, len(prefixes), done)
+            last_save = time.monotonic()
+
+    try:
+        if not workers or workers == 1:
+            for prefix in pending:
+                record(prefix, count_prefix_chunk(n, [prefix]))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(count_prefix_chunk, n, [prefix]): prefix for prefix in pending}
+                try:
+                    for future in as_completed(futures):
+                        record(futures[future], future.result())
+                except BaseException:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+    finally:
+        save_checkpoint(path, n, prefix_depth, len(prefixes), done)
+    return sum(done.values())
+
+def board_from_columns(queens, n):
+    # 把“每行皇后所在列”的表示还原为 N×N 的 0/1 棋盘
+    board = [[0] * n for _ in range(n)]
+    for row, col in enumerate(queens):
+        board[row][col] = 1
+    return board
+
+def is_valid_solution(queens, n=None):
+    # 校验“每行皇后所在列”的数组：共 n 行，列在范围内，且列、两条对角线都互不相同
+    n = len(queens) if n is None else n
+    if len(queens) != n or any(not 0 <= col < n for col in queens):
+        return False
+    return (len(set(queens)) == n
+            and len({row + col for row, col in enumerate(queens)}) == n
+            and len({row - col for row, col in enumerate(queens)}) == n)
+
+def constructive_n_queens(n):
+    # 按 n mod 6 的经典显式构造直接写出一个解，O(N) 时间，结果确定（N=2、3 无解时返回 None）
+    # 先放偶数列 2, 4, ...，再放奇数列 1, 3, ...（从 1 开始编号）；
+    # n mod 6 == 2 时交换奇数列中的 1、3 并把 5 移到最后，
+    # n mod 6 == 3 时把偶数列中的 2 移到最后，把奇数列中的 1、3 移到最后
+    if n in (2, 3):
+        return None
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    if n % 6 == 2:
+        odds = [3, 1] + odds[3:] + [5]
+    elif n % 6 == 3:
+        evens = evens[1:] + [2]
+        odds = odds[2:] + [1, 3]
+    return [col - 1 for col in evens + odds]
+
+def min_conflicts_n_queens(n, seed=None, max_steps=None):
+    # 最小冲突局部搜索，返回一个解的列数组（N=2、3 无解时返回 None），可用于 N=10^6
+    # 各行皇后的列始终是一个排列，列冲突恒为 0；两组对角线上的皇后数保存在数组中，
+    # 交换两行皇后只需更新 8 个计数，冲突查询和移动都是 O(1)
+    if n in (2, 3):
+        return None
+    rand = random.Random(seed).random
+    if max_steps is None:
+        max_steps = 100 * n
+    m = n - 1
+
+    while True:
+        queens = list(range(n))
+        diag1 = [0] * (2 * n - 1)  # 下标 row + col
+        diag2 = [0] * (2 * n - 1)  # 下标 row - col + n - 1
+
+        # 贪心初始化：前 n - tail 行依次从尚未使用的列中随机抽取，优先选两条对角线都空的列，
+        # 最后 tail 行随机放置，留给修复阶段处理
+        tail = min(n // 2, 32)
+        for row in range(n):
+            k = n - row
+            for _ in range(256 if row < n - tail else 1):
+                j = row + int(rand() * k)
+                col = queens[j]
+                if not diag1[row + col] and not diag2[m + row - col]:
+                    break
+            queens[j] = queens[row]
+            queens[row] = col
+            diag1[row + col] += 1
+            diag2[m + row - col] += 1
+
+        collisions = (sum(c - 1 for c in diag1 if c > 1)
+                      + sum(c - 1 for c in diag2 if c > 1))
+
+        # 修复阶段：为每个受攻击的行随机挑选交换对象，接受第一个使冲突数下降的交换
+        # 只有交换过的行才可能新受到攻击，因此每轮只需复查上一轮留下的行
+        attacked = [row for row, col in enumerate(queens)
+                    if diag1[row + col] > 1 or diag2[m + row - col] > 1]
+        steps = 0
+        while collisions and attacked and steps < max_steps:
+            remaining = []
+            for i in attacked:
+                a = queens[i]
+                if diag1[i + a] < 2 and diag2[m + i - a] < 2:
+                    continue
+                for _ in range(min(n, 64)):
+                    steps += 1
+                    j = int(rand() * n)
+                    b = queens[j]
+                    # 先移除 i、j 两行的皇后，再放到交换后的位置，同时累计冲突数的变化
+                    delta = 0
+                    for r, c, step in ((i, a, -1), (j, b, -1), (i, b, 1), (j, a, 1)):
+                        before = diag1[r + c]
+                        diag1[r + c] = before + step
+                        if before > 1 or (step > 0 and before):
+                            delta += step
+                        before = diag2[m + r - c]
+                        diag2[m + r - c] = before + step
+                        if before > 1 or (step > 0 and before):
+                            delta += step
+                    # 冲突数下降时接受；不变时以小概率接受（横向移动），用来走出平台
+                    moved = delta < 0 or (delta == 0 and i != j and rand() < 0.1)
+                    if moved:
+                        break
+                    # 没有改善，撤销这次交换
+                    for r, c, step in ((i, b, -1), (j, a, -1), (i, a, 1), (j, b, 1)):
+                        diag1[r + c] += step
+                        diag2[m + r - c] += step
+                if moved:
+                    queens[i], queens[j] = b, a
+                    collisions += delta
+                    remaining += (i, j)
+                else:
+                    remaining.append(i)
+                if not collisions:
+                    break
+            attacked = remaining
+
+        if not collisions:
+            return queens
+        # 陷入局部最优，换一个随机初始状态重来
+
+ENGINES = ("bitmask", "board")
+
+# 求解器版本，写入磁盘缓存的每条结果；求解逻辑变化可能影响结果时递增，旧缓存随之失效
+ENGINE_VERSION = "1"
+
+# main() 中只求一个解且 N 超过该值时，改用 O(N) 的显式构造，不再回溯，也不分配 N×N 棋盘
+CONSTRUCTIVE_THRESHOLD = 32
+
+def solve_n_queens(n, single_solution=False, engine="bitmask", stats=None):
     # 检查输入是否合法
+    # stats 为 SearchStats 时统计棋盘引擎的搜索过程（节点、放置、回溯、各深度的分支数和剪枝率）
+    if engine not in ENGINES:
+        raise ValueError(f"未知的求解引擎: {engine}，可选值为 {ENGINES}")
+    if stats is not None and engine != "board":
+        raise ValueError("搜索统计只支持 board 引擎")
     if n < 4:
         print("N必须至少为4")
         return [], 0
 
-    board = [[0 for _ in range(n)] for _ in range(n)]  # 初始化棋盘
     solutions = []
-    solve_n_queens_util(board, 0, n, solutions, single_solution)
+    if engine == "bitmask":
+        for queens in iter_n_queens(n):
+            solutions.append(board_from_columns(queens, n))
+            if single_solution:
+                break
+    else:
+        board = [[0 for _ in range(n)] for _ in range(n)]  # 初始化棋盘
+        if stats is None:
+            solve_n_queens_util(board, 0, n, solutions, single_solution)
+        else:
+            with stats.attach_module(sys.modules[__name__]):
+                solve_n_queens_util(board, 0, n, solutions, single_solution)
 
     return solutions, len(solutions)
 
@@ -53,21 +506,138 @@ def print_board(board):
         print(" ".join("Q" if x else "-" for x in row))
     print()
 
-def main():
-    try:
-        n = int(input("请输入棋盘大小（N ≥ 4）："))
-    except ValueError:
-        print("无效输入。请输入一个整数。")
+def cached_result(store, n, mode, compute):
+    # 通过磁盘缓存获取结果，store 为 None 时直接计算；compute() 返回 (字段, 解集或 None)
+    if store is None:
+        return compute()
+    return store.fetch(n, mode, compute)
+
+def print_columns(queens):
+    # 小棋盘直接画出来，大棋盘只打印前几行皇后所在的列
+    n = len(queens)
+    if n <= CONSTRUCTIVE_THRESHOLD:
+        print_board(board_from_columns(queens, n))
+    else:
+        print(f"各行皇后所在列（前 {CONSTRUCTIVE_THRESHOLD} 行）:", queens[:CONSTRUCTIVE_THRESHOLD])
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="N皇后问题求解器")
+    parser.add_argument("n", nargs="?", type=int, help="棋盘大小（N ≥ 4），省略时交互输入")
+    parser.add_argument("--count-only", action="store_true", help="只统计解的个数，不生成棋盘")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="只计数时使用的进程数，省略时单进程求解")
+    parser.add_argument("--unique", action="store_true",
+                        help="只计数时同时统计本质不同的解（旋转、翻转后相同的算一个）；"
+                             "与 --save 一起使用时只保存各对称类的代表解")
+    parser.add_argument("--save", metavar="PATH", default=None,
+                        help="把全部解边求解边写入紧凑的二进制解集文件，不在内存中保存")
+    parser.add_argument("--cache-dir", default=None,
+                        help="结果缓存目录，默认取环境变量 N_QUEENS_CACHE_DIR 或 ~/.cache/n_queens")
+    parser.add_argument("--no-cache", action="store_true", help="不读写结果缓存")
+    parser.add_argument("--single", action="store_true", help="只求一个解，不再询问")
+    parser.add_argument("--min-conflicts", action="store_true",
+                        help="用最小冲突局部搜索求一个解，适用于 N 很大的情况")
+    parser.add_argument("--seed", type=int, default=None, help="最小冲突搜索的随机种子")
+    parser.add_argument("--checkpoint", metavar="PATH", default=None,
+                        help="只计数时定期把已完成的子树及其解数写入检查点文件")
+    parser.add_argument("--resume", action="store_true", help="从 --checkpoint 指定的检查点继续计数")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0,
+                        help="写检查点的最短间隔（秒），默认 60")
+    parser.add_argument("--stats", action="store_true",
+                        help="用棋盘引擎回溯求全部解，打印节点数、回溯次数及各深度的分支数和剪枝率")
+    args = parser.parse_args(argv)
+    # 对称约简的计数只在单进程中完成，不支持多进程和检查点
+    if args.unique and (args.workers or args.checkpoint):
+        parser.error("--unique 不能与 --workers 或 --checkpoint 同时使用")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.resume and not args.checkpoint:
+        print("--resume 需要同时指定 --checkpoint")
         return
+    n = args.n
+    if n is None:
+        try:
+            n = int(input("请输入棋盘大小（N ≥ 4）："))
+        except ValueError:
+            print("无效输入。请输入一个整数。")
+            return
 
     if n < 4:
         print("N必须至少为4。")
         return
 
-    choice = input("是否只需要一个解？(y/n): ").strip().lower()
-    single_solution = choice == 'y'
+    store = None if args.no_cache else ResultStore(args.cache_dir, ENGINE_VERSION)
+
+    if args.count_only:
+        if args.unique:
+            def count_unique():
+                unique, total = count_n_queens_symmetric(n)
+                return {"unique": unique, "count": total}, None
+
+            header, _ = cached_result(store, n, "fundamental", count_unique)
+            print(f"N={n}共有{header['count']}个解，其中本质不同的解{header['unique']}个")
+            return
+
+        def count():
+            if args.checkpoint:
+                return {"count": count_n_queens_checkpointed(n, args.checkpoint, args.resume, args.workers,
+                                                             interval=args.checkpoint_interval)}, None
+            if args.workers:
+                return {"count": solve_n_queens_parallel(n, args.workers, count_only=True)[1]}, None
+            return {"count": count_n_queens(n)}, None
+
+        try:
+            header, _ = cached_result(store, n, "count", count)
+        except (FileExistsError, ValueError) as exc:
+            print(exc)
+            return
+        print(f"N={n}共有{header['count']}个解")
+        return
+
+    if args.save:
+        # 只有保存解集时才需要 numpy，按需导入
+        from n_queens_file import FLAG_FUNDAMENTAL, write_solutions
+        if args.unique:
+            solutions = (queens for queens, _ in iter_fundamental_n_queens(n))
+            written = write_solutions(args.save, n, solutions, FLAG_FUNDAMENTAL)
+        else:
+            written = write_solutions(args.save, n, iter_n_queens(n))
+        print(f"已将N={n}的{written}个解写入 {args.save}")
+        return
+
+    if args.stats:
+        stats = SearchStats()
+        _, total_solutions = solve_n_queens(n, engine="board", stats=stats)
+        print(f"N={n}共有{total_solutions}个解")
+        print(stats.report())
+        return
+
+    if args.min_conflicts:
+        queens = min_conflicts_n_queens(n, seed=args.seed)
+        if not is_valid_solution(queens, n):
+            raise RuntimeError(f"最小冲突搜索返回了非法解 (N={n})")
+        print(f"N={n}的一个解（已通过校验）:")
+        print_columns(queens)
+        return
+
+    single_solution = args.single or input("是否只需要一个解？(y/n): ").strip().lower() == 'y'
+    if single_solution and n > CONSTRUCTIVE_THRESHOLD:
+        print(f"N={n}的一个可能解:")
+        print_columns(constructive_n_queens(n))
+        return
+
+    if single_solution:
+        solutions, total_solutions = solve_n_queens(n, single_solution)
+    else:
+        def solve():
+            columns = list(iter_n_queens(n))
+            return {"count": len(columns)}, columns
 
-    solutions, total_solutions = solve_n_queens(n, single_solution)
+        _, columns = cached_result(store, n, "solutions", solve)
+        solutions = [board_from_columns(queens, n) for queens in columns]
+        total_solutions = len(solutions)
     if total_solutions == 0:
         print(f"N={n}时没有解")
     elif single_solution:
@@ -0,0 +1,190 @@
+"""
+N 皇后解集的紧凑二进制文件格式
+
+文件由 32 字节的头和按解依次排列的列号组成，全部为小端序：
+    magic   4 字节  b"NQSF"
+    version uint16  格式版本
+    flags   uint16  FLAG_WIDE：列号为 uint16（N > 256 时必须）；FLAG_FUNDAMENTAL：只含对称类代表解
+    n       uint32  棋盘大小
+    count   uint64  解的个数
+    (12 字节保留)
+之后是 count × n 个列号，第 k 个解第 r 行的皇后在第 columns[k, r] 列。
+N=15 的 2,279,184 个解只占约 34MB；写入端边求解边写，读取端用 np.memmap 按需分页。
+"""
+
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+import numpy as np
+
+MAGIC = b"NQSF"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIQ12x")
+
+FLAG_WIDE = 1
+FLAG_FUNDAMENTAL = 2
+
+
+class SolutionWriter:
+    """边求解边写入解集文件；写完后原子地替换目标文件"""
+
+    def __init__(self, path, n, flags=0, buffer_solutions=65536):
+        if n > 65536:
+            raise ValueError(f"列号最多用 uint16 存储，N={n} 过大")
+        self.path = path
+        self.n = n
+        self.flags = flags | (FLAG_WIDE if n > 256 else 0)
+        self.typecode = "H" if self.flags & FLAG_WIDE else "B"
+        self.buffer_limit = buffer_solutions * n
+        self.buffer = array(self.typecode)
+        self.count = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        self.file = os.fdopen(fd, "wb")
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.flags, n, 0))
+
+    def write(self, queens):
+        if len(queens) != self.n:
+            raise ValueError(f"解的长度 {len(queens)} 与 N={self.n} 不符")
+        self.buffer.extend(queens)
+        self.count += 1
+        if len(self.buffer) >= self.buffer_limit:
+            self.flush()
+
+    def flush(self):
+        if self.typecode == "H" and sys.byteorder == "big":
+            self.buffer.byteswap()
+        self.file.write(self.buffer.tobytes())
+        self.buffer = array(self.typecode)
+
+    def close(self):
+        """写回解的个数并把临时文件移动到目标位置"""
+        self.flush()
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.flags, self.n, self.count))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        os.unlink(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_solutions(path, n, solutions, flags=0):
+    """把任意可迭代的解（列序列）写入文件，返回写入的解数"""
+    with SolutionWriter(path, n, flags) as writer:
+        for queens in solutions:
+            writer.write(queens)
+    return writer.count
+
+
+class SolutionFile:
+    """只读打开解集文件；columns 是形状为 (count, n) 的 np.memmap，不会一次读入内存"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            raw = f.read(HEADER.size)
+        if len(raw) != HEADER.size:
+            raise ValueError(f"{path} 不是 N 皇后解集文件：文件过短")
+        magic, version, self.flags, self.n, self.count = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path} 不是 N 皇后解集文件")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"不支持的解集文件版本 {version}")
+        dtype = np.dtype("<u2" if self.flags & FLAG_WIDE else "u1")
+        expected = HEADER.size + self.count * self.n * dtype.itemsize
+        if os.path.getsize(path) != expected:
+            raise ValueError(f"{path} 长度与头中记录的解数不符")
+        if self.count:
+            self.columns = np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size,
+                                     shape=(self.count, self.n))
+        else:
+            self.columns = np.empty((0, self.n), dtype=dtype)
+
+    @property
+    def fundamental(self):
+        return bool(self.flags & FLAG_FUNDAMENTAL)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.columns[index]
+
+    def chunks(self, size=16384):
+        """按块遍历，每块是 (size, n) 的普通数组"""
+        for start in range(0, self.count, size):
+            yield np.asarray(self.columns[start:start + size], dtype=np.int32)
+
+
+def valid_mask(columns):
+    """逐行判断 (m, n) 列号数组中的每个解是否合法：列和两条对角线都互不相同"""
+    columns = np.asarray(columns, dtype=np.int32)
+    m, n = columns.shape
+    rows = np.arange(n)
+    valid = np.ones(m, dtype=bool)
+    for keys in (columns, rows + columns, rows - columns):
+        ordered = np.sort(keys, axis=1)
+        valid &= ~(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+    return valid & (columns >= 0).all(axis=1) & (columns < n).all(axis=1)
+
+
+def validate_file(solution_file, chunk_size=16384):
+    """分块校验整个文件，返回非法解的个数"""
+    return sum(int((~valid_mask(chunk)).sum()) for chunk in solution_file.chunks(chunk_size))
+
+
+def symmetric_images_batch(columns):
+    """(m, n) 列号数组在二面体群 D4 下的 8 个像，返回形状为 (8, m, n) 的数组"""
+    columns = np.asarray(columns, dtype=np.int32)
+    m, n = columns.shape
+    last = n - 1
+    rot90 = np.empty_like(columns)
+    rot90[np.arange(m)[:, None], columns] = last - np.arange(n)
+    rot180 = last - columns[:, ::-1]
+    rot270 = last - rot90[:, ::-1]
+    images = []
+    for image in (columns, rot90, rot180, rot270):
+        images.append(image)
+        images.append(last - image)  # 左右翻转
+    return np.stack(images)
+
+
+def orbit_sizes(columns):
+    """每个解若是所在对称类的代表（8 个像中字典序最小者）则为该类的解数，否则为 0"""
+    images = symmetric_images_batch(columns)
+    original = images[0]
+    canonical = np.ones(len(original), dtype=bool)
+    fixed = np.zeros(len(original), dtype=np.int32)
+    for image in images:
+        differ = image != original
+        same = ~differ.any(axis=1)
+        first = differ.argmax(axis=1)
+        smaller = image[np.arange(len(image)), first] < original[np.arange(len(image)), first]
+        canonical &= same | ~smaller
+        fixed += same
+    return np.where(canonical, 8 // fixed, 0)
+
+
+def fundamental_counts(solution_file, chunk_size=16384):
+    """分块统计文件中的对称类：返回 (代表解个数, 各类解数之和)"""
+    unique = total = 0
+    for chunk in solution_file.chunks(chunk_size):
+        sizes = orbit_sizes(chunk)
+        unique += int(np.count_nonzero(sizes))
+        total += int(sizes.sum())
+    return unique, total
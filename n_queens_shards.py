@@ -0,0 +1,168 @@
+"""
+把 N 皇后计数拆成分片，在多台机器上各自运行后合并
+
+按前 depth 行的放法把搜索树切成互相独立的工作单元（与 solve_n_queens_parallel 相同的切法），
+再把工作单元轮流分配到各个分片。全部通过文件交换，不需要共享调度器：
+    plan       生成任务清单（JSON）：N、前缀深度、求解器版本、全部工作单元及其所属分片
+    run-shard  计算清单中的一个分片，写出结果文件（每个工作单元的解数与分片总数）
+    merge      检查每个分片的结果恰好出现一次且与清单一致，然后合并计数
+清单带有由内容计算出的 id，结果文件记录它，混入其他清单的结果会被拒绝。
+
+用法:
+    python n_queens_shards.py plan 19 --shards 64 --depth 3 --output manifest.json
+    python n_queens_shards.py run-shard manifest.json 7 --output-dir results --workers 8
+    python n_queens_shards.py merge manifest.json results/*.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from n_queens import ENGINE_VERSION, count_prefix_chunk, n_queens_prefixes, write_json_atomic
+
+
+def manifest_id(manifest):
+    """清单内容（不含 id 字段）的摘要"""
+    body = {key: value for key, value in manifest.items() if key != "id"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def plan(n, shards, depth=2):
+    """生成任务清单；工作单元按字典序编号后轮流分到各分片，使各分片的负载相近"""
+    if n < 4:
+        raise ValueError("N必须至少为4")
+    depth = min(depth, n)
+    prefixes = n_queens_prefixes(n, depth)
+    shards = max(1, min(shards, len(prefixes)))
+    manifest = {
+        "n": n,
+        "prefix_depth": depth,
+        "version": ENGINE_VERSION,
+        "units": [list(prefix) for prefix in prefixes],
+        "shards": [list(range(shard, len(prefixes), shards)) for shard in range(shards)],
+    }
+    manifest["id"] = manifest_id(manifest)
+    return manifest
+
+
+def load_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("id") != manifest_id(manifest):
+        raise ValueError(f"{path} 的内容与其 id 不符，清单可能被修改过")
+    if manifest.get("version") != ENGINE_VERSION:
+        raise ValueError(f"{path} 由求解器版本 {manifest.get('version')} 生成，当前版本为 {ENGINE_VERSION}")
+    return manifest
+
+
+def run_shard(manifest, shard, workers=None):
+    """计算一个分片中的全部工作单元，返回结果字典"""
+    if not 0 <= shard < len(manifest["shards"]):
+        raise ValueError(f"分片编号 {shard} 超出范围 [0, {len(manifest['shards'])})")
+    n = manifest["n"]
+    unit_ids = manifest["shards"][shard]
+    start = time.perf_counter()
+    if not workers or workers == 1:
+        counts = [count_prefix_chunk(n, [manifest["units"][unit]]) for unit in unit_ids]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(count_prefix_chunk, n, [manifest["units"][unit]]) for unit in unit_ids]
+            counts = [future.result() for future in futures]
+    return {
+        "manifest_id": manifest["id"],
+        "n": n,
+        "shard": shard,
+        "units": dict(zip(map(str, unit_ids), counts)),
+        "count": sum(counts),
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def shard_result_path(directory, shard):
+    return os.path.join(directory, f"shard-{shard:05d}.json")
+
+
+def merge(manifest, results):
+    """校验分片结果并返回总解数；有缺失、重复、多余或与清单不符的结果时抛出 ValueError"""
+    seen = {}
+    problems = []
+    for result in results:
+        shard = result.get("shard")
+        if result.get("manifest_id") != manifest["id"]:
+            problems.append(f"分片 {shard} 的结果属于另一份清单 {result.get('manifest_id')}")
+        elif not isinstance(shard, int) or not 0 <= shard < len(manifest["shards"]):
+            problems.append(f"清单中没有分片 {shard}")
+        elif shard in seen:
+            problems.append(f"分片 {shard} 的结果出现了不止一次")
+        elif (not isinstance(result.get("units"), dict)
+              or sorted(map(int, result["units"])) != manifest["shards"][shard]):
+            problems.append(f"分片 {shard} 的工作单元与清单不符")
+        elif sum(result["units"].values()) != result["count"]:
+            problems.append(f"分片 {shard} 的总数与各工作单元之和不符")
+        else:
+            seen[shard] = result["count"]
+    missing = [shard for shard in range(len(manifest["shards"])) if shard not in seen]
+    if missing:
+        problems.append(f"缺少 {len(missing)} 个分片的结果: {missing[:20]}{' ...' if len(missing) > 20 else ''}")
+    if problems:
+        raise ValueError("\n".join(problems))
+    return sum(seen.values())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="N皇后分片计数")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = commands.add_parser("plan", help="生成任务清单")
+    plan_parser.add_argument("n", type=int, help="棋盘大小（N ≥ 4）")
+    plan_parser.add_argument("--shards", type=int, required=True, help="分片个数")
+    plan_parser.add_argument("--depth", type=int, default=2, help="按前几行的放法切分工作单元，默认 2")
+    plan_parser.add_argument("--output", default="manifest.json", help="清单文件路径")
+
+    run_parser = commands.add_parser("run-shard", help="计算一个分片")
+    run_parser.add_argument("manifest", help="清单文件路径")
+    run_parser.add_argument("shard", type=int, help="分片编号（从 0 开始）")
+    run_parser.add_argument("--output-dir", default=".", help="结果文件所在目录")
+    run_parser.add_argument("--workers", type=int, default=None, help="使用的进程数，省略时单进程计算")
+
+    merge_parser = commands.add_parser("merge", help="校验并合并各分片的结果")
+    merge_parser.add_argument("manifest", help="清单文件路径")
+    merge_parser.add_argument("results", nargs="+", help="分片结果文件")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.command == "plan":
+            manifest = plan(args.n, args.shards, args.depth)
+            write_json_atomic(args.output, manifest)
+            print(f"已将N={args.n}的{len(manifest['units'])}个工作单元分成{len(manifest['shards'])}个分片，"
+                  f"清单写入 {args.output}（id {manifest['id']}）")
+        elif args.command == "run-shard":
+            manifest = load_manifest(args.manifest)
+            result = run_shard(manifest, args.shard, args.workers)
+            os.makedirs(args.output_dir, exist_ok=True)
+            path = shard_result_path(args.output_dir, args.shard)
+            write_json_atomic(path, result)
+            print(f"分片 {args.shard}: {result['count']} 个解，用时 {result['elapsed_s']:.2f} 秒，结果写入 {path}")
+        else:
+            manifest = load_manifest(args.manifest)
+            results = []
+            for path in args.results:
+                with open(path, encoding="utf-8") as f:
+                    results.append(json.load(f))
+            total = merge(manifest, results)
+            print(f"N={manifest['n']}共有{total}个解（{len(results)} 个分片）")
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
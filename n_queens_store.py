@@ -0,0 +1,95 @@
+"""
+N 皇后结果的磁盘缓存
+
+每个 (N, 模式) 对应缓存目录中的一个文件：第一行是 JSON 头（求解器版本、N、模式、计数等），
+之后是可选的解集，按解依次存放各行皇后所在的列，N ≤ 256 时每列 1 字节，否则 2 字节。
+头中的版本与当前求解器版本不一致时视为失效，重新计算后覆盖。
+写入时先写同目录下的临时文件再 os.replace，其他进程不会读到写了一半的文件。
+"""
+
+import json
+import os
+import sys
+import tempfile
+from array import array
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "n_queens")
+MODES = ("count", "fundamental", "solutions")
+
+
+class ResultStore:
+    """按 (N, 模式, 求解器版本) 保存计数、本质不同解的个数和解集"""
+
+    def __init__(self, directory=None, version="1"):
+        self.directory = directory or os.environ.get("N_QUEENS_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.version = str(version)
+
+    def path(self, n, mode):
+        if mode not in MODES:
+            raise ValueError(f"未知的缓存模式: {mode}，可选值为 {MODES}")
+        return os.path.join(self.directory, f"{mode}-{n}.bin")
+
+    def get(self, n, mode):
+        """返回 (头信息, 解集或 None)；没有缓存、文件损坏或版本不符时返回 None"""
+        try:
+            with open(self.path(n, mode), "rb") as f:
+                header = json.loads(f.readline())
+                payload = f.read()
+        except (OSError, ValueError):
+            return None
+        if (header.get("version") != self.version or header.get("n") != n
+                or header.get("mode") != mode):
+            return None
+        if "itemsize" not in header:
+            return header, None
+
+        packed = array("B" if header["itemsize"] == 1 else "H")
+        if len(payload) != header["solutions"] * n * packed.itemsize:
+            return None
+        packed.frombytes(payload)
+        if header["byteorder"] != sys.byteorder:
+            packed.byteswap()
+        solutions = [tuple(packed[i:i + n]) for i in range(0, len(packed), n)]
+        return header, solutions
+
+    def put(self, n, mode, fields, solutions=None):
+        """原子地写入一条结果，返回与 get 相同的 (头信息, 解集)"""
+        header = dict(fields, version=self.version, n=n, mode=mode)
+        payload = b""
+        if solutions is not None:
+            packed = array("B" if n <= 256 else "H")
+            for queens in solutions:
+                packed.extend(queens)
+            header.update(itemsize=packed.itemsize, byteorder=sys.byteorder,
+                          solutions=len(solutions))
+            payload = packed.tobytes()
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path(n, mode))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return header, solutions
+
+    def fetch(self, n, mode, compute):
+        """先查缓存；未命中时调用 compute() 得到 (字段, 解集或 None)，写入后返回"""
+        cached = self.get(n, mode)
+        if cached is not None:
+            return cached
+        fields, solutions = compute()
+        return self.put(n, mode, fields, solutions)
+
+    def clear(self):
+        """删除缓存目录中的所有结果文件"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".bin") and name.split("-", 1)[0] in MODES:
+                os.remove(os.path.join(self.directory, name))
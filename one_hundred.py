@@ -1,72 +1,328 @@
+import argparse
+import math
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 import time
 from collections import Counter
 
 
+def max_cycle_length(perm, limit=None):
+    """排列的最长循环长度，每个元素只访问一次
+
+    循环策略成功当且仅当最长循环不超过 K。给出 limit 时，
+    一旦走到长度超过 limit 的循环就立即返回 limit + 1。
+    """
+    if hasattr(perm, 'tolist'):
+        perm = perm.tolist()
+    n = len(perm)
+    visited = bytearray(n)
+    longest = 0
+    for start in range(n):
+        if visited[start]:
+            continue
+        length = 0
+        current = start
+        while not visited[current]:
+            visited[current] = 1
+            length += 1
+            if limit is not None and length > limit:
+                return length
+            current = perm[current]
+        if length > longest:
+            longest = length
+    return longest
+
+
+def batch_cycle_sizes(boxes):
+    """一批排列（每行一个）的循环长度表
+
+    用指针倍增求出每个元素所在循环的最小下标作为循环标签，
+    再按标签计数：结果第 b 行第 j 列是第 b 个排列中以 j 为最小元素的循环长度，
+    j 不是任何循环的最小元素时为 0。全程没有逐个囚犯的 Python 循环。
+    """
+    batch, n = boxes.shape
+    labels = np.broadcast_to(np.arange(n), (batch, n)).copy()
+    jump = boxes.copy()
+    # 第 r 轮后 labels[i] 覆盖 i 之后的 2^r 个元素，2^r >= N 即覆盖整个循环
+    for _ in range((n - 1).bit_length()):
+        np.minimum(labels, np.take_along_axis(labels, jump, axis=1), out=labels)
+        jump = np.take_along_axis(jump, jump, axis=1)
+    labels += np.arange(batch)[:, None] * n
+    return np.bincount(labels.ravel(), minlength=batch * n).reshape(batch, n)
+
+
+def batch_max_cycle_lengths(boxes):
+    """一批排列（每行一个）各自的最长循环长度"""
+    return batch_cycle_sizes(boxes).max(axis=1)
+
+
+class CycleStats:
+    """循环长度统计量
+
+    用长度为 N + 1 的计数器按批累加，内存与模拟轮数无关：
+    cycle_length_counts[L] 为所有排列中长度为 L 的循环个数，
+    max_cycle_counts[L] 为最长循环恰为 L 的排列个数。
+    """
+
+    def __init__(self, N):
+        self.N = N
+        self.trials = 0
+        self.cycle_length_counts = np.zeros(N + 1, dtype=np.int64)
+        self.max_cycle_counts = np.zeros(N + 1, dtype=np.int64)
+
+    def update(self, boxes):
+        """累加一批排列（每行一个）的统计量"""
+        sizes = batch_cycle_sizes(boxes)
+        self.trials += len(boxes)
+        self.cycle_length_counts += np.bincount(sizes[sizes > 0], minlength=self.N + 1)
+        self.max_cycle_counts += np.bincount(sizes.max(axis=1), minlength=self.N + 1)
+        return self
+
+    def merge(self, other):
+        """合并另一份（例如其他进程算出的）统计量"""
+        self.trials += other.trials
+        self.cycle_length_counts += other.cycle_length_counts
+        self.max_cycle_counts += other.max_cycle_counts
+        return self
+
+    def success_curve(self):
+        """循环策略对每个 K = 0..N 的成功率，即最长循环 <= K 的比例"""
+        return np.cumsum(self.max_cycle_counts) / max(self.trials, 1)
+
+
+def run_cycle_stats_batch(N, seed_sequence, size):
+    """在一个独立的子随机流上生成一批排列并统计循环长度（可在工作进程中调用）"""
+    boxes = PrisonerSimulator(N, N, seed_sequence).generate_boxes_batch(size)
+    return CycleStats(N).update(boxes)
+
+
+# 无界面批处理模式：不询问参数，图像用 Agg 后端写入文件，不调用阻塞的 plt.show()
+# 可通过 --headless 或环境变量 PRISONERS_HEADLESS=1 打开
+HEADLESS = os.environ.get("PRISONERS_HEADLESS", "") not in ("", "0")
+
+
+def get_pyplot():
+    """第一次真正绘图时才导入 matplotlib，模拟核心只依赖 numpy"""
+    import matplotlib
+    # Linux 下没有 DISPLAY 时交互式后端也无法打开窗口，同样改用 Agg
+    if HEADLESS or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def show_figure(plt):
+    """交互模式下显示当前图像；无界面时图像已保存，直接关闭"""
+    if HEADLESS or plt.get_backend().lower() == "agg":
+        plt.close()
+    else:
+        plt.show()
+
+
+def plot_loop_length_distribution(stats, filename='loop_distribution.png'):
+    """根据 CycleStats 绘制循环长度分布"""
+    plt = get_pyplot()
+    lengths = np.arange(stats.N + 1)
+    longest = int(lengths[stats.cycle_length_counts > 0].max(initial=1))
+    plt.hist(lengths, bins=range(1, longest + 2), weights=stats.cycle_length_counts, alpha=0.7)
+    plt.xlabel('Loop Length')
+    plt.ylabel('Frequency')
+    plt.title('Distribution of Loop Lengths')
+    plt.savefig(filename)
+    show_figure(plt)
+
+
+# 按 (K, exact) 缓存的 P(n 个元素的随机排列没有长度超过 K 的循环)，n = 0, 1, 2, ...
+SUCCESS_PROBABILITY_CACHE = {}
+
+
+def exact_success_probability(N, K, exact=False):
+    """循环策略的精确成功率 P(最长循环 <= K)，适用于任意 K
+
+    元素 0 所在循环长度为 j 的概率都是 1/n，于是
+    p(n) = (p(n-1) + p(n-2) + ... + p(n-K)) / n，p(0) = 1。
+    exact 为 True 时返回 Fraction，否则返回 float；计算结果跨调用缓存。
+    """
+    if exact:
+        from fractions import Fraction  # 只有要求精确分数时才导入，不拖慢 import one_hundred
+    if K >= N:
+        return Fraction(1) if exact else 1.0
+    if K <= 0:
+        return Fraction(0) if exact else 0.0
+
+    probs = SUCCESS_PROBABILITY_CACHE.setdefault((K, exact), [Fraction(1) if exact else 1.0])
+    for n in range(len(probs), N + 1):
+        window = probs[max(0, n - K):n]
+        if exact:
+            probs.append(sum(window, Fraction(0)) / n)
+        else:
+            probs.append(math.fsum(window) / n)
+    return probs[N]
+
+
+def batch_sizes(T, batch_size):
+    """把 T 轮模拟切成若干批的大小"""
+    return [min(batch_size, T - start) for start in range(0, T, batch_size)]
+
+
+def run_batch(N, K, seed_sequence, size, strategy='loop'):
+    """在一个独立的子随机流上跑一批模拟，返回每轮是否成功（可在工作进程中调用）"""
+    simulator = PrisonerSimulator(N, K, seed_sequence)
+    if strategy == 'loop':
+        boxes = simulator.generate_boxes_batch(size)
+        return batch_max_cycle_lengths(boxes) <= K
+    return simulator.random_strategy_batch(size)
+
+
 class PrisonerSimulator:
-    def __init__(self, N=100, K=50):
+    def __init__(self, N=100, K=50, seed=None):
+        """seed 可以是整数、None 或 numpy.random.SeedSequence
+
+        每一批模拟都使用从 seed 派生（spawn）出的独立子随机流，
+        因此同一个 seed 在任意进程数下得到逐位相同的结果。
+        """
         self.N = N
         self.K = K
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
 
     def generate_boxes(self):
         """生成随机盒子配置"""
-        return np.random.permutation(self.N)
+        return self.rng.permutation(self.N)
+
+    def generate_boxes_batch(self, size):
+        """一次生成 size 组盒子配置，与连续调用 size 次 generate_boxes 得到的排列相同"""
+        return self.rng.permuted(np.tile(np.arange(self.N), (size, 1)), axis=1)
 
     def random_strategy(self, boxes):
-        """随机开箱策略"""
-        successes = 0
+        """随机开箱策略，有一个囚犯失败即整轮失败"""
         for prisoner in range(self.N):
-            found = False
-            choices = np.random.choice(self.N, self.K, replace=False)
-            for choice in choices:
-                if boxes[choice] == prisoner:
-                    found = True
-                    break
-            if found:
-                successes += 1
-        return successes == self.N
+            choices = self.rng.choice(self.N, self.K, replace=False)
+            if prisoner not in boxes[choices]:
+                return False
+        return True
+
+    def random_strategy_batch(self, size):
+        """一次判定 size 轮随机策略是否成功
+
+        无论盒子如何排列，每个囚犯随机打开 K 个盒子时都以 K/N 的概率独立地找到自己，
+        所以按囚犯顺序第一个失败者的位置服从几何分布，只需为每轮抽一个数：
+        第一个失败者排在 N 之后即为成功，分布与逐个囚犯模拟完全相同。
+        """
+        if self.K >= self.N:
+            return np.ones(size, dtype=bool)
+        if self.K <= 0:
+            return np.zeros(size, dtype=bool)
+        first_failure = self.rng.geometric(1 - self.K / self.N, size)
+        return first_failure > self.N
 
     def loop_strategy(self, boxes):
-        """循环策略"""
-        successes = 0
-        for prisoner in range(self.N):
-            found = False
-            next_box = prisoner
-            for _ in range(self.K):
-                if boxes[next_box] == prisoner:
-                    found = True
-                    break
-                next_box = boxes[next_box]
-            if found:
-                successes += 1
-        return successes == self.N
-
-    def simulate(self, T=10000, strategy='loop'):
-        """运行模拟"""
+        """循环策略：每个囚犯沿自己所在的循环开箱，成功当且仅当最长循环不超过 K"""
+        return max_cycle_length(boxes, self.K) <= self.K
+
+    def simulate(self, T=10000, strategy='loop', batch_size=10000):
+        """运行模拟
+
+        batch_size 只决定随机流的划分；与 simulate_batch 取相同的值时两者使用相同的排列。
+        """
         results = []
-        strategy_fn = self.loop_strategy if strategy == 'loop' else self.random_strategy
+        streams = self.seed_sequence.spawn(len(batch_sizes(T, batch_size)))
 
-        for _ in range(T):
-            boxes = self.generate_boxes()
-            success = strategy_fn(boxes)
-            results.append(success)
+        for size, stream in zip(batch_sizes(T, batch_size), streams):
+            batch = PrisonerSimulator(self.N, self.K, stream)
+            strategy_fn = batch.loop_strategy if strategy == 'loop' else batch.random_strategy
+            for _ in range(size):
+                boxes = batch.generate_boxes()
+                success = strategy_fn(boxes)
+                results.append(success)
 
         success_rate = sum(results) / T
         return results, success_rate
 
+    def simulate_batch(self, T=10000, batch_size=10000, strategy='loop', workers=1):
+        """按批向量化运行模拟
+
+        循环策略成功当且仅当排列的最长循环不超过 K，
+        固定种子时与 simulate(T, 'loop') 使用相同的排列，结果一致；
+        随机策略见 random_strategy_batch，不需要生成排列。
+        workers 大于 1 时各批分给进程池执行，结果与单进程逐位相同。
+        """
+        if strategy not in ('loop', 'random'):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        sizes = batch_sizes(T, batch_size)
+        streams = self.seed_sequence.spawn(len(sizes))
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor  # 只在并行时导入
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_batch, self.N, self.K, stream, size, strategy)
+                           for size, stream in zip(sizes, streams)]
+                parts = [future.result() for future in futures]
+        else:
+            parts = [run_batch(self.N, self.K, stream, size, strategy)
+                     for size, stream in zip(sizes, streams)]
+
+        results = np.concatenate(parts) if parts else np.empty(0, dtype=bool)
+        success_rate = results.sum() / T
+        return results, success_rate
+
+    def cycle_stats(self, T=10000, batch_size=10000, workers=1):
+        """抽样 T 个排列，按批累加为一个 CycleStats"""
+        sizes = batch_sizes(T, batch_size)
+        streams = self.seed_sequence.spawn(len(sizes))
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_cycle_stats_batch, self.N, stream, size)
+                           for size, stream in zip(sizes, streams)]
+                parts = [future.result() for future in futures]
+        else:
+            parts = [run_cycle_stats_batch(self.N, stream, size) for size, stream in zip(sizes, streams)]
+
+        stats = CycleStats(self.N)
+        for part in parts:
+            stats.merge(part)
+        return stats
+
+    def max_cycle_histogram(self, T=10000, batch_size=10000, workers=1):
+        """抽样 T 个排列，返回最长循环长度的直方图 hist，hist[L] 为最长循环恰为 L 的次数
+
+        循环策略在 K 下成功当且仅当最长循环 <= K，
+        所以 cumsum(hist) / T 一次给出所有 K 的成功率。
+        """
+        return self.cycle_stats(T, batch_size, workers).max_cycle_counts
+
+    def parameter_sweep(self, K_values=None, T=10000, analytic=False):
+        """循环策略成功率随 K 的变化，返回 {K: 成功率}
+
+        analytic 为 True 时直接用 exact_success_probability 计算，不做模拟；
+        否则只抽样一次排列，从最长循环长度直方图的累积和读出全部 K 的成功率。
+        """
+        if K_values is None:
+            K_values = range(1, self.N + 1)
+
+        if analytic:
+            return {K: exact_success_probability(self.N, K) for K in K_values}
+
+        curve = np.cumsum(self.max_cycle_histogram(T)) / T
+        return {K: curve[min(max(K, 0), self.N)] for K in K_values}
+
     def run_experiments(self, T=10000):
         """对比两种策略"""
         print(f"Simulating {T} trials...")
 
         # 循环策略
         start = time.time()
-        loop_results, loop_rate = self.simulate(T, 'loop')
+        loop_results, loop_rate = self.simulate_batch(T, strategy='loop')
         loop_time = time.time() - start
 
         # 随机策略
         start = time.time()
-        random_results, random_rate = self.simulate(T, 'random')
+        random_results, random_rate = self.simulate_batch(T, strategy='random')
         random_time = time.time() - start
 
         # 打印结果
@@ -74,54 +330,58 @@ class PrisonerSimulator:
         print(f"Random strategy success rate: {random_rate:.4f} (Time: {random_time:.2f}s)")
 
         # 绘制成功率比较
+        plt = get_pyplot()
         plt.bar(['Loop Strategy', 'Random Strategy'], [loop_rate, random_rate])
         plt.ylabel('Success Rate')
         plt.title('Prisoner Problem Strategy Comparison')
         plt.ylim(0, 0.4)
         plt.savefig('prisoners_comparison.png')
-        plt.show()
+        show_figure(plt)
 
         # 循环长度分布
         self.loop_length_distribution(T)
 
     def loop_length_distribution(self, T):
-        """分析循环长度分布"""
-        loop_lengths = []
-        for _ in range(T):
-            boxes = self.generate_boxes()
-            visited = [False] * self.N
-            for i in range(self.N):
-                if not visited[i]:
-                    count = 0
-                    current = i
-                    while not visited[current]:
-                        visited[current] = True
-                        count += 1
-                        current = boxes[current]
-                    loop_lengths.append(count)
-
-        # 绘制分布图
-        plt.hist(loop_lengths, bins=range(1, max(loop_lengths) + 2), alpha=0.7)
-        plt.xlabel('Loop Length')
-        plt.ylabel('Frequency')
-        plt.title('Distribution of Loop Lengths')
-        plt.savefig('loop_distribution.png')
-        plt.show()
+        """分析循环长度分布，返回统计得到的 CycleStats"""
+        stats = self.cycle_stats(T)
+        plot_loop_length_distribution(stats)
+        return stats
+
 
+def main(argv=None):
+    global HEADLESS
+    parser = argparse.ArgumentParser(description="100 Prisoners Problem Simulator")
+    parser.add_argument("--analytic", action="store_true",
+                        help="print exact success rates for every K instead of simulating")
+    parser.add_argument("-N", type=int, help="number of prisoners")
+    parser.add_argument("-K", type=int, help="number of attempts")
+    parser.add_argument("-T", type=int, help="simulation trials")
+    parser.add_argument("--headless", action="store_true",
+                        help="never prompt or open windows; figures are only written to files")
+    args = parser.parse_args(argv)
+    HEADLESS = HEADLESS or args.headless
 
-def main():
     print("100 Prisoners Problem Simulator")
 
-    # 获取参数
-    try:
-        N = int(input("Number of prisoners (default 100): ") or 100)
-        K = int(input("Number of attempts (default 50): ") or 50)
-        T = int(input("Simulation trials (default 10000): ") or 10000)
-    except ValueError:
-        print("Invalid input. Using defaults.")
-        N, K, T = 100, 50, 10000
+    # 获取参数：命令行未给出的参数在交互模式下询问，无界面模式下取默认值
+    N, K, T = args.N, args.K, 0 if args.analytic else args.T
+    if HEADLESS:
+        N, K, T = N or 100, K or 50, T if T is not None else 10000
+    else:
+        try:
+            N = N or int(input("Number of prisoners (default 100): ") or 100)
+            K = K or int(input("Number of attempts (default 50): ") or 50)
+            T = T if T is not None else int(input("Simulation trials (default 10000): ") or 10000)
+        except ValueError:
+            print("Invalid input. Using defaults.")
+            N, K, T = 100, 50, 10000
 
     simulator = PrisonerSimulator(N, K)
+    if args.analytic:
+        print(f"Exact loop strategy success rate (N={N}, K={K}): {exact_success_probability(N, K):.6f}")
+        for k, rate in simulator.parameter_sweep(analytic=True).items():
+            print(f"K={k:4d}: {rate:.6f}")
+        return
     simulator.run_experiments(T)
 
 
@@ -0,0 +1,139 @@
+"""
+回溯搜索的可选统计
+
+SearchStats 统计访问的节点数、放置和撤销皇后的次数、冲突检查与剪枝次数，
+并按深度记录分支数直方图（每个节点有几个子节点）和剪枝率。
+
+统计通过临时替换求解器的函数实现，不需要改动求解代码：
+    - attach(solver)：求解器实例上的 backtrack(row, ...)、is_safe(row, col)、
+      place_queen(row, col)、remove_queen(row, col)（LiuYuQiao 的 NQueens、马子恒的 NQueensSolver）
+    - attach_module(module)：模块级的 solve_n_queens_util(board, row, ...) 和
+      is_safe(board, row, ...)（根目录 n_queens.py 的棋盘引擎）
+离开 with 块后恢复原函数，不开启统计时求解代码没有任何额外开销。
+"""
+
+import contextlib
+from collections import Counter, defaultdict
+
+
+class SearchStats:
+    """按深度累计的回溯搜索计数器"""
+
+    def __init__(self):
+        self.nodes = Counter()        # 深度 -> 访问的节点数
+        self.placements = Counter()   # 深度 -> 放置皇后的次数
+        self.backtracks = Counter()   # 深度 -> 撤销皇后的次数
+        self.checks = Counter()       # 深度 -> 冲突检查次数
+        self.pruned = Counter()       # 深度 -> 检查不通过（被剪掉）的次数
+        self.branching = defaultdict(Counter)  # 深度 -> {子节点数: 节点数}
+
+    def wrap_search(self, search, depth_index, count_moves=False):
+        """包装递归搜索函数：统计节点及其子节点数。
+
+        count_moves 为 True 时，把进入深度 d 的节点记为在深度 d-1 放置了一个皇后，
+        返回时记为撤销，适用于放置和撤销写在搜索函数内部的实现。
+        """
+        nodes, branching = self.nodes, self.branching
+        placements, backtracks = self.placements, self.backtracks
+
+        def wrapper(*args, **kwargs):
+            depth = args[depth_index]
+            nodes[depth] += 1
+            if count_moves and depth:
+                placements[depth - 1] += 1
+            before = nodes[depth + 1]
+            try:
+                return search(*args, **kwargs)
+            finally:
+                branching[depth][nodes[depth + 1] - before] += 1
+                if count_moves and depth:
+                    backtracks[depth - 1] += 1
+
+        return wrapper
+
+    def wrap_check(self, check, depth_index):
+        checks, pruned = self.checks, self.pruned
+
+        def wrapper(*args, **kwargs):
+            depth = args[depth_index]
+            checks[depth] += 1
+            safe = check(*args, **kwargs)
+            if not safe:
+                pruned[depth] += 1
+            return safe
+
+        return wrapper
+
+    @staticmethod
+    def wrap_move(move, counter):
+        def wrapper(row, *args, **kwargs):
+            counter[row] += 1
+            return move(row, *args, **kwargs)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def attach(self, solver):
+        """在 with 块内统计求解器实例的 backtrack/is_safe/place_queen/remove_queen"""
+        patches = {
+            "backtrack": self.wrap_search(solver.backtrack, 0),
+            "is_safe": self.wrap_check(solver.is_safe, 0),
+            "place_queen": self.wrap_move(solver.place_queen, self.placements),
+            "remove_queen": self.wrap_move(solver.remove_queen, self.backtracks),
+        }
+        for name, wrapper in patches.items():
+            setattr(solver, name, wrapper)  # 实例属性优先于类上的方法
+        try:
+            yield self
+        finally:
+            for name in patches:
+                delattr(solver, name)
+
+    @contextlib.contextmanager
+    def attach_module(self, module, search="solve_n_queens_util", check="is_safe", depth_index=1):
+        """在 with 块内统计模块级的递归搜索函数和冲突检查函数"""
+        originals = {search: getattr(module, search), check: getattr(module, check)}
+        setattr(module, search, self.wrap_search(originals[search], depth_index, count_moves=True))
+        setattr(module, check, self.wrap_check(originals[check], depth_index))
+        try:
+            yield self
+        finally:
+            for name, original in originals.items():
+                setattr(module, name, original)
+
+    def summary(self):
+        """汇总为可直接写入 JSON 的字典"""
+        def rate(pruned, checks):
+            return pruned / checks if checks else 0.0
+
+        depths = sorted(set(self.nodes) | set(self.checks))
+        return {
+            "nodes": sum(self.nodes.values()),
+            "placements": sum(self.placements.values()),
+            "backtracks": sum(self.backtracks.values()),
+            "checks": sum(self.checks.values()),
+            "pruned": sum(self.pruned.values()),
+            "prune_rate": rate(sum(self.pruned.values()), sum(self.checks.values())),
+            "depths": [{
+                "depth": depth,
+                "nodes": self.nodes[depth],
+                "placements": self.placements[depth],
+                "backtracks": self.backtracks[depth],
+                "checks": self.checks[depth],
+                "pruned": self.pruned[depth],
+                "prune_rate": rate(self.pruned[depth], self.checks[depth]),
+                "branching": {str(k): v for k, v in sorted(self.branching[depth].items())},
+            } for depth in depths],
+        }
+
+    def report(self):
+        """按深度排成表格的文本"""
+        total = self.summary()
+        lines = [f"节点 {total['nodes']}，放置 {total['placements']}，回溯 {total['backtracks']}，"
+                 f"检查 {total['checks']}，剪枝 {total['pruned']}（剪枝率 {total['prune_rate']:.1%}）",
+                 "深度      节点      放置      剪枝率  分支数直方图 (子节点数:节点数)"]
+        for row in total["depths"]:
+            histogram = " ".join(f"{k}:{v}" for k, v in row["branching"].items())
+            lines.append(f"{row['depth']:>4} {row['nodes']:>9} {row['placements']:>9} "
+                         f"{row['prune_rate']:>10.1%}  {histogram}")
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+"""
+根目录 bench_n_queens.py 的测试
+"""
+
+import os
+import tempfile
+import textwrap
+import unittest
+
+import bench_n_queens
+
+SAMPLE_SOLVERS = textwrap.dedent('''
+    def solve_n_queens(n):
+        solutions = []
+
+        def place(queens):
+            row = len(queens)
+            if row == n:
+                solutions.append(list(queens))
+                return
+            for col in range(n):
+                if all(col != c and abs(col - c) != row - r for r, c in enumerate(queens)):
+                    place(queens + [col])
+
+        place([])
+        return solutions, len(solutions)
+
+    def solve_one_queens(n):
+        return [list(range(n))]
+
+    class Solver:
+        def __init__(self):
+            self.solutions = []
+
+        def solve(self, n):
+            self.solutions = solve_n_queens(n)[0]
+            return 0.5  # 只返回耗时
+
+        def print_board(self, n):
+            print(n)
+''')
+
+
+class TestBenchHarness(unittest.TestCase):
+
+    def test_solution_count(self):
+        class Owner:
+            solutions = [[0], [1]]
+
+        self.assertEqual(bench_n_queens.solution_count(92), 92)
+        self.assertEqual(bench_n_queens.solution_count(([[0]] * 3, 3)), 3)
+        self.assertEqual(bench_n_queens.solution_count([[0]] * 4), 4)
+        self.assertEqual(bench_n_queens.solution_count(None, Owner()), 2)
+        self.assertEqual(bench_n_queens.solution_count(0.25, Owner()), 2)
+        self.assertIsNone(bench_n_queens.solution_count(True))
+        self.assertIsNone(bench_n_queens.solution_count("N must be at least 4."))
+
+    def test_parse_sizes(self):
+        self.assertEqual(bench_n_queens.parse_sizes("4-6,8"), [4, 5, 6, 8])
+
+    def test_benchmark_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solvers.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE_SOLVERS)
+            results = bench_n_queens.benchmark_file(path, [4, 5], repeat=2, time_budget=10)
+
+        by_name = {entry["entry"].rsplit(":", 1)[1]: entry for entry in results}
+        self.assertEqual(set(by_name), {"solve_n_queens", "solve_one_queens", "Solver.solve"})
+        self.assertEqual(by_name["solve_one_queens"]["status"], "skipped")
+        for name in ("solve_n_queens", "Solver.solve"):
+            entry = by_name[name]
+            self.assertEqual(entry["status"], "ok")
+            record = entry["sizes"]["5"]
+            self.assertEqual(record["count"], 10)
+            self.assertLessEqual(record["min_s"], record["median_s"])
+            self.assertLessEqual(record["median_s"], record["max_s"])
+            self.assertGreater(record["calls"], 10)
+            self.assertGreater(record["peak_bytes"], 0)
+
+    def test_compare(self):
+        def report(median, low, high):
+            return {"results": [{"entry": "a.py:solve", "sizes": {
+                "8": {"median_s": median, "min_s": low, "max_s": high}}}]}
+
+        baseline = report(1.0, 0.9, 1.1)
+        slower, = bench_n_queens.compare(report(2.0, 1.8, 2.2), baseline)
+        self.assertAlmostEqual(slower["ratio"], 2.0)
+        self.assertTrue(slower["regression"])
+        # 中位数变慢但计时区间与基线重叠，视为抖动
+        noisy, = bench_n_queens.compare(report(1.5, 1.0, 2.0), baseline)
+        self.assertFalse(noisy["regression"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,594 @@
+"""
+根目录 n_queens.py 的回归测试
+"""
+
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+# 子目录中的作业也有同名的 n_queens 模块，pytest 在仓库根目录收集时
+# 可能已经缓存了它，这里强制加载根目录下的版本
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.modules.pop("n_queens", None)
+
+import n_queens  # noqa: E402
+import n_queens_file  # noqa: E402
+import n_queens_shards  # noqa: E402
+import n_queens_store  # noqa: E402
+from search_stats import SearchStats  # noqa: E402
+
+KNOWN_COUNTS = {4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724, 11: 2680, 12: 14200}
+KNOWN_FUNDAMENTAL = {4: 1, 5: 2, 6: 1, 7: 6, 8: 12, 9: 46, 10: 92, 11: 341, 12: 1787}
+
+
+class TestBitmaskEngine(unittest.TestCase):
+    """位棋盘引擎与原始棋盘引擎的一致性测试"""
+
+    def test_counts_match_board_engine(self):
+        """N=4..12 时两种引擎的解数一致"""
+        for n in range(4, 13):
+            with self.subTest(n=n):
+                _, board_count = n_queens.solve_n_queens(n, engine="board")
+                _, bitmask_count = n_queens.solve_n_queens(n, engine="bitmask")
+                self.assertEqual(board_count, KNOWN_COUNTS[n])
+                self.assertEqual(bitmask_count, board_count)
+
+    def test_solutions_match_board_engine(self):
+        """小规模时两种引擎给出相同顺序的相同棋盘"""
+        for n in range(4, 9):
+            with self.subTest(n=n):
+                board_solutions, _ = n_queens.solve_n_queens(n, engine="board")
+                bitmask_solutions, _ = n_queens.solve_n_queens(n, engine="bitmask")
+                self.assertEqual(bitmask_solutions, board_solutions)
+
+    def test_default_engine_is_bitmask(self):
+        """默认引擎为位棋盘，且单解模式只返回第一个解"""
+        solutions, count = n_queens.solve_n_queens(8, single_solution=True)
+        board_solutions, _ = n_queens.solve_n_queens(8, engine="board")
+        self.assertEqual(count, 1)
+        self.assertEqual(solutions[0], board_solutions[0])
+
+    def test_board_engine_single_solution(self):
+        """棋盘引擎的单解模式找到第一个解后即停止"""
+        for n in range(4, 9):
+            with self.subTest(n=n):
+                board_solutions, count = n_queens.solve_n_queens(n, True, engine="board")
+                bitmask_solutions, _ = n_queens.solve_n_queens(n, True)
+                self.assertEqual(count, 1)
+                self.assertEqual(board_solutions, bitmask_solutions)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            n_queens.solve_n_queens(8, engine="unknown")
+
+
+class TestCountOnly(unittest.TestCase):
+    """只计数模式测试"""
+
+    def test_counts(self):
+        for n, expected in KNOWN_COUNTS.items():
+            with self.subTest(n=n):
+                self.assertEqual(n_queens.count_n_queens(n), expected)
+
+    def test_small_n(self):
+        self.assertEqual(n_queens.count_n_queens(3), 0)
+
+    def test_cli_count_only(self):
+        args = n_queens.parse_args(["10", "--count-only"])
+        self.assertEqual(args.n, 10)
+        self.assertTrue(args.count_only)
+
+
+class TestIterNQueens(unittest.TestCase):
+    """生成器接口测试"""
+
+    def test_matches_solve(self):
+        for n in range(4, 9):
+            with self.subTest(n=n):
+                solutions, _ = n_queens.solve_n_queens(n)
+                boards = [n_queens.board_from_columns(q, n) for q in n_queens.iter_n_queens(n)]
+                self.assertEqual(boards, solutions)
+
+    def test_early_break(self):
+        """大规模时也能只取前几个解"""
+        first = list(itertools.islice(n_queens.iter_n_queens(20), 5))
+        self.assertEqual(len(first), 5)
+        self.assertEqual(len(set(first)), 5)
+        for queens in first:
+            self.assertIsInstance(queens, tuple)
+            self.assertEqual(sorted(queens), list(range(20)))
+
+    def test_small_n(self):
+        self.assertEqual(list(n_queens.iter_n_queens(3)), [])
+
+    def test_invalid_prefix(self):
+        """越界或自身冲突的前缀没有解"""
+        for prefix in ((-1,), (8,), (0, -3), (0, 1), (2, 2)):
+            with self.subTest(prefix=prefix):
+                self.assertIsNone(n_queens.prefix_state(8, prefix))
+                self.assertEqual(list(n_queens.iter_n_queens(8, prefix)), [])
+        self.assertEqual(n_queens.prefix_state(8, ()), (0, 0, 0))
+
+    def test_deep_search_without_recursion(self):
+        """显式栈搜索的深度不受递归层数限制，递归实现在同样的深度会溢出"""
+        import bench_iterative
+
+        n = 3000
+        prefix = n_queens.constructive_n_queens(n)[:-10]
+        queens = next(n_queens.iter_n_queens(n, prefix))
+        self.assertEqual(queens[:len(prefix)], tuple(prefix))
+        self.assertTrue(n_queens.is_valid_solution(queens, n))
+        with self.assertRaises(RecursionError):
+            bench_iterative.recursive_n_queens(n, prefix, limit=1)
+        # 不超过递归层数时两者给出相同的解
+        self.assertEqual(bench_iterative.recursive_n_queens(9), list(n_queens.iter_n_queens(9)))
+
+
+class TestSymmetry(unittest.TestCase):
+    """对称约简枚举测试"""
+
+    def test_counts(self):
+        for n, expected in KNOWN_FUNDAMENTAL.items():
+            with self.subTest(n=n):
+                unique, total = n_queens.count_n_queens_symmetric(n)
+                self.assertEqual(unique, expected)
+                self.assertEqual(total, KNOWN_COUNTS[n])
+
+    def test_orbits_cover_all_solutions(self):
+        """各代表解的 8 个像恰好覆盖全部解"""
+        for n in range(4, 10):
+            with self.subTest(n=n):
+                covered = set()
+                for queens, orbit_size in n_queens.iter_fundamental_n_queens(n):
+                    images = set(n_queens.symmetric_images(queens))
+                    self.assertEqual(len(images), orbit_size)
+                    self.assertFalse(covered & images)
+                    covered |= images
+                self.assertEqual(covered, set(n_queens.iter_n_queens(n)))
+
+    def test_cli_rejects_workers_and_checkpoint(self):
+        for extra in (["--workers", "2"], ["--checkpoint", "ckpt.json"]):
+            with self.subTest(extra=extra), contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    n_queens.parse_args(["10", "--count-only", "--unique"] + extra)
+        self.assertTrue(n_queens.parse_args(["10", "--count-only", "--unique"]).unique)
+
+
+class TestParallel(unittest.TestCase):
+    """多进程求解测试"""
+
+    def test_counts(self):
+        for n in range(4, 11):
+            for depth in (1, 2, 3):
+                with self.subTest(n=n, prefix_depth=depth):
+                    _, count = n_queens.solve_n_queens_parallel(n, workers=2, prefix_depth=depth,
+                                                                count_only=True)
+                    self.assertEqual(count, KNOWN_COUNTS[n])
+
+    def test_solutions_in_serial_order(self):
+        solutions, count = n_queens.solve_n_queens_parallel(9, workers=2)
+        self.assertEqual(count, KNOWN_COUNTS[9])
+        # 与 solve_n_queens 一样返回 N×N 棋盘
+        self.assertEqual(solutions, n_queens.solve_n_queens(9)[0])
+
+    def test_prefixes_partition_the_search(self):
+        prefixes = n_queens.n_queens_prefixes(8, 2)
+        self.assertEqual(len(prefixes), len(set(prefixes)))
+        self.assertEqual(sum(n_queens.count_prefix_chunk(8, [p]) for p in prefixes), 92)
+
+
+class TestMinConflicts(unittest.TestCase):
+    """最小冲突局部搜索与解校验测试"""
+
+    def test_validator(self):
+        for queens in n_queens.iter_n_queens(6):
+            self.assertTrue(n_queens.is_valid_solution(queens))
+        self.assertFalse(n_queens.is_valid_solution([0, 1, 2, 3]))  # 同一对角线
+        self.assertFalse(n_queens.is_valid_solution([1, 3, 0, 0]))  # 同一列
+        self.assertFalse(n_queens.is_valid_solution([1, 3, 0, 4]))  # 越界
+        self.assertFalse(n_queens.is_valid_solution([1, 3, 0, 2], 5))  # 行数不够
+
+    def test_small_n(self):
+        for n in (1, 4, 5, 6, 7, 8, 12, 30):
+            for seed in range(5):
+                with self.subTest(n=n, seed=seed):
+                    self.assertTrue(n_queens.is_valid_solution(n_queens.min_conflicts_n_queens(n, seed)))
+
+    def test_no_solution(self):
+        self.assertIsNone(n_queens.min_conflicts_n_queens(2))
+        self.assertIsNone(n_queens.min_conflicts_n_queens(3))
+
+    def test_seed_is_reproducible(self):
+        self.assertEqual(n_queens.min_conflicts_n_queens(500, seed=7),
+                         n_queens.min_conflicts_n_queens(500, seed=7))
+
+    def test_large_n(self):
+        queens = n_queens.min_conflicts_n_queens(100_000, seed=1)
+        self.assertTrue(n_queens.is_valid_solution(queens, 100_000))
+
+
+def load_solver(relpath, name):
+    """按路径加载作业目录里的求解器，避免与根目录的模块重名"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relpath))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def pairwise_conflicts(individual):
+    """遗传算法原来的 O(N²) 冲突计数：重复的列数 + 同一斜线上的皇后对数"""
+    n = len(individual)
+    conflicts = n - len(set(individual))
+    for i in range(n):
+        for j in range(i + 1, n):
+            if abs(i - j) == abs(individual[i] - individual[j]):
+                conflicts += 1
+    return conflicts
+
+
+class TestGeneticFitness(unittest.TestCase):
+    """Xiao Junhao 遗传算法的向量化冲突计数与交换变异的增量更新"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.evo = load_solver("01_2023141461149_Xiao Junhao/N_queens_evo.py", "xiao_junhao_evo")
+
+    def random_population(self, rng, pop, n):
+        # 一半是排列，一半允许列重复
+        rows = [rng.sample(range(n), n) for _ in range(pop // 2)]
+        rows += [rng.choices(range(n), k=n) for _ in range(pop - pop // 2)]
+        return np.array(rows)
+
+    def test_population_conflicts_match_pairwise_count(self):
+        rng = random.Random(2024)
+        for n in (1, 2, 4, 8, 13, 30):
+            with self.subTest(n=n):
+                population = self.random_population(rng, 40, n)
+                expected = [pairwise_conflicts(row.tolist()) for row in population]
+                self.assertEqual(self.evo.population_conflicts(population).tolist(), expected)
+                self.assertEqual(self.evo.calculate_conflicts(population[0].tolist()), expected[0])
+        # 全部皇后在同一列、同一斜线上的极端情况
+        self.assertEqual(self.evo.calculate_conflicts([3] * 6), pairwise_conflicts([3] * 6))
+        self.assertEqual(self.evo.calculate_conflicts(list(range(6))), 15)
+
+    def test_mutate_delta_matches_rescore(self):
+        rng = random.Random(7)
+        random.seed(7)  # mutate 使用 random 模块选择交换位置
+        for case in range(300):
+            n = rng.randint(2, 24)
+            population = self.random_population(rng, 2, n)
+            conflicts = self.evo.population_conflicts(population)
+            diag1, diag2 = self.evo.diagonal_counts(population)
+            k = case % 2
+            delta = self.evo.mutate(population[k], 1.0, diag1[k], diag2[k])
+            rescored = self.evo.population_conflicts(population)
+            self.assertEqual(conflicts[k] + delta, rescored[k])
+            self.assertEqual(rescored[1 - k], conflicts[1 - k])
+            # 就地更新后的斜线计数与重新统计的一致
+            new_diag1, new_diag2 = self.evo.diagonal_counts(population)
+            np.testing.assert_array_equal(diag1, new_diag1)
+            np.testing.assert_array_equal(diag2, new_diag2)
+
+    def test_mutate_respects_rate(self):
+        population = np.array([[0, 1, 2, 3]])
+        diag1, diag2 = self.evo.diagonal_counts(population)
+        self.assertEqual(self.evo.mutate(population[0], 0.0, diag1[0], diag2[0]), 0)
+        self.assertEqual(population[0].tolist(), [0, 1, 2, 3])
+
+
+class TestConstructive(unittest.TestCase):
+    """显式构造单解测试"""
+
+    def test_valid_for_every_n(self):
+        for n in list(range(4, 300)) + [100_000, 100_001, 100_002, 100_003]:
+            with self.subTest(n=n):
+                queens = n_queens.constructive_n_queens(n)
+                self.assertEqual(len(queens), n)
+                self.assertTrue(n_queens.is_valid_solution(queens))
+
+    def test_no_solution(self):
+        self.assertEqual(n_queens.constructive_n_queens(1), [0])
+        self.assertIsNone(n_queens.constructive_n_queens(2))
+        self.assertIsNone(n_queens.constructive_n_queens(3))
+
+    def test_main_uses_construction_above_threshold(self):
+        n = n_queens.CONSTRUCTIVE_THRESHOLD + 8
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            n_queens.main([str(n), "--single"])
+        self.assertIn(str(n_queens.constructive_n_queens(n)[:n_queens.CONSTRUCTIVE_THRESHOLD]),
+                      out.getvalue())
+
+
+class TestResultStore(unittest.TestCase):
+    """结果缓存测试"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = n_queens_store.ResultStore(self.tmp.name, n_queens.ENGINE_VERSION)
+
+    def test_round_trip(self):
+        solutions = list(n_queens.iter_n_queens(8))
+        self.store.put(8, "solutions", {"count": 92}, solutions)
+        header, cached = self.store.get(8, "solutions")
+        self.assertEqual(header["count"], 92)
+        self.assertEqual(cached, solutions)
+        self.assertEqual(self.store.get(9, "solutions"), None)
+        # 写入完成后目录里只剩结果文件，没有残留的临时文件
+        self.assertEqual(os.listdir(self.tmp.name), ["solutions-8.bin"])
+
+    def test_wide_columns(self):
+        queens = tuple(n_queens.constructive_n_queens(300))
+        self.store.put(300, "solutions", {"count": 1}, [queens])
+        self.assertEqual(self.store.get(300, "solutions")[1], [queens])
+
+    def test_fetch_computes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"count": n_queens.count_n_queens(10)}, None
+
+        for _ in range(3):
+            header, _ = self.store.fetch(10, "count", compute)
+            self.assertEqual(header["count"], 724)
+        self.assertEqual(len(calls), 1)
+
+    def test_version_change_invalidates(self):
+        self.store.put(8, "count", {"count": 92})
+        newer = n_queens_store.ResultStore(self.tmp.name, "new-engine")
+        self.assertIsNone(newer.get(8, "count"))
+        newer.fetch(8, "count", lambda: ({"count": 92}, None))
+        self.assertEqual(newer.get(8, "count")[0]["version"], "new-engine")
+        self.assertIsNone(self.store.get(8, "count"))
+
+    def test_corrupt_file_is_a_miss(self):
+        with open(self.store.path(8, "solutions"), "wb") as f:
+            f.write(b"not json")
+        self.assertIsNone(self.store.get(8, "solutions"))
+
+    def test_main_count_only_uses_cache(self):
+        self.store.put(11, "count", {"count": 12345})
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            n_queens.main(["11", "--count-only", "--cache-dir", self.tmp.name])
+            n_queens.main(["11", "--count-only", "--no-cache"])
+        self.assertEqual(out.getvalue().split(), ["N=11共有12345个解", "N=11共有2680个解"])
+
+
+class TestSolutionFile(unittest.TestCase):
+    """二进制解集文件测试"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "solutions.nqs")
+
+    def test_round_trip(self):
+        solutions = list(n_queens.iter_n_queens(8))
+        self.assertEqual(n_queens_file.write_solutions(self.path, 8, iter(solutions)), 92)
+        solution_file = n_queens_file.SolutionFile(self.path)
+        self.assertEqual((len(solution_file), solution_file.n), (92, 8))
+        self.assertEqual(solution_file.columns.dtype.itemsize, 1)
+        self.assertEqual([tuple(row.tolist()) for row in solution_file.columns], solutions)
+        self.assertEqual(tuple(solution_file[5].tolist()), solutions[5])
+        self.assertEqual(os.path.getsize(self.path), n_queens_file.HEADER.size + 92 * 8)
+
+    def test_streaming_flushes(self):
+        """缓冲区多次写出时内容保持不变"""
+        with n_queens_file.SolutionWriter(self.path, 9, buffer_solutions=7) as writer:
+            for queens in n_queens.iter_n_queens(9):
+                writer.write(queens)
+        solution_file = n_queens_file.SolutionFile(self.path)
+        self.assertEqual([tuple(row.tolist()) for row in solution_file.columns],
+                         list(n_queens.iter_n_queens(9)))
+
+    def test_wide_columns(self):
+        queens = n_queens.constructive_n_queens(300)
+        n_queens_file.write_solutions(self.path, 300, [queens])
+        solution_file = n_queens_file.SolutionFile(self.path)
+        self.assertEqual(solution_file.columns.dtype, np.dtype("<u2"))
+        self.assertEqual(solution_file[0].tolist(), queens)
+        self.assertEqual(n_queens_file.validate_file(solution_file), 0)
+
+    def test_validation(self):
+        columns = np.array([[1, 3, 0, 2], [0, 1, 2, 3], [1, 3, 0, 0], [2, 0, 3, 1]])
+        self.assertEqual(n_queens_file.valid_mask(columns).tolist(), [True, False, False, True])
+
+    def test_symmetry_matches_scalar_version(self):
+        for n in range(4, 10):
+            with self.subTest(n=n):
+                solutions = list(n_queens.iter_n_queens(n))
+                expected = [n_queens.canonical_orbit_size(queens) for queens in solutions]
+                self.assertEqual(n_queens_file.orbit_sizes(np.array(solutions)).tolist(), expected)
+                n_queens_file.write_solutions(self.path, n, solutions)
+                self.assertEqual(n_queens_file.fundamental_counts(
+                    n_queens_file.SolutionFile(self.path), chunk_size=5),
+                    (KNOWN_FUNDAMENTAL[n], KNOWN_COUNTS[n]))
+
+    def test_cli_save_fundamental(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            n_queens.main(["8", "--save", self.path, "--unique"])
+        solution_file = n_queens_file.SolutionFile(self.path)
+        self.assertTrue(solution_file.fundamental)
+        self.assertEqual(n_queens_file.fundamental_counts(solution_file), (12, 92))
+
+    def test_rejects_bad_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"solution text\n" * 4)
+        with self.assertRaises(ValueError):
+            n_queens_file.SolutionFile(self.path)
+        n_queens_file.write_solutions(self.path, 8, n_queens.iter_n_queens(8))
+        with open(self.path, "r+b") as f:
+            f.truncate(100)
+        with self.assertRaises(ValueError):
+            n_queens_file.SolutionFile(self.path)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """计数检查点与续算"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "count.json")
+
+    def test_interrupted_run_resumes(self):
+        original = n_queens.count_prefix_chunk
+        calls = 0
+
+        def interrupt_after_five(n, prefixes):
+            nonlocal calls
+            calls += 1
+            if calls > 5:
+                raise KeyboardInterrupt
+            return original(n, prefixes)
+
+        n_queens.count_prefix_chunk = interrupt_after_five
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                n_queens.count_n_queens_checkpointed(10, self.path, interval=3600)
+        finally:
+            n_queens.count_prefix_chunk = original
+
+        # 中断时写下已完成的 5 个前缀
+        self.assertEqual(len(n_queens.load_checkpoint(self.path, 10, 2)), 5)
+        with self.assertRaises(FileExistsError):
+            n_queens.count_n_queens_checkpointed(10, self.path)
+        self.assertEqual(n_queens.count_n_queens_checkpointed(10, self.path, resume=True), 724)
+        self.assertEqual(n_queens.count_n_queens_checkpointed(10, self.path, resume=True), 724)
+
+    def test_mismatched_checkpoint(self):
+        n_queens.count_n_queens_checkpointed(8, self.path)
+        with self.assertRaises(ValueError):
+            n_queens.count_n_queens_checkpointed(9, self.path, resume=True)
+
+    def test_parallel(self):
+        self.assertEqual(n_queens.count_n_queens_checkpointed(9, self.path, workers=2), 352)
+
+    def test_killed_process_resumes(self):
+        """被 SIGKILL 杀掉的计数进程可以从检查点续算出相同的结果"""
+        command = [sys.executable, os.path.join(ROOT, "n_queens.py"), "12", "--count-only", "--no-cache",
+                   "--checkpoint", self.path, "--checkpoint-interval", "0"]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 60
+            while not os.path.exists(self.path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            process.kill()
+            process.wait()
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            n_queens.main(["12", "--count-only", "--no-cache", "--checkpoint", self.path, "--resume"])
+        self.assertIn("14200", output.getvalue())
+
+
+class TestShards(unittest.TestCase):
+    """分片清单、分片计算与合并"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.manifest = n_queens_shards.plan(10, shards=4, depth=2)
+
+    def test_plan_partitions_units(self):
+        units = sorted(unit for shard in self.manifest["shards"] for unit in shard)
+        self.assertEqual(units, list(range(len(self.manifest["units"]))))
+        self.assertEqual(len(self.manifest["shards"]), 4)
+        self.assertEqual(len(n_queens_shards.plan(10, shards=1000)["shards"]), len(self.manifest["units"]))
+
+    def test_run_and_merge(self):
+        results = [n_queens_shards.run_shard(self.manifest, shard) for shard in range(4)]
+        self.assertEqual(n_queens_shards.merge(self.manifest, results), 724)
+        parallel = n_queens_shards.run_shard(self.manifest, 0, workers=2)
+        self.assertEqual(parallel["units"], results[0]["units"])
+
+    def test_merge_rejects_bad_results(self):
+        results = [n_queens_shards.run_shard(self.manifest, shard) for shard in range(4)]
+        other = n_queens_shards.run_shard(n_queens_shards.plan(10, shards=3), 0)
+        tampered = dict(results[1], count=results[1]["count"] + 1)
+        for bad in (results[:3], results + results[:1], results[:3] + [other], [results[0], tampered] + results[2:]):
+            with self.assertRaises(ValueError):
+                n_queens_shards.merge(self.manifest, bad)
+
+    def test_cli(self):
+        manifest_path = os.path.join(self.dir, "manifest.json")
+        results_dir = os.path.join(self.dir, "results")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(n_queens_shards.main(["plan", "9", "--shards", "3", "--output", manifest_path]), 0)
+            for shard in range(3):
+                n_queens_shards.main(["run-shard", manifest_path, str(shard), "--output-dir", results_dir])
+        paths = sorted(os.path.join(results_dir, name) for name in os.listdir(results_dir))
+        self.assertEqual(len(paths), 3)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(n_queens_shards.main(["merge", manifest_path] + paths), 0)
+        self.assertIn("352", output.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(n_queens_shards.main(["merge", manifest_path] + paths[:2]), 1)
+
+
+class TestSearchStats(unittest.TestCase):
+    """三种集合/棋盘回溯实现的搜索统计"""
+
+    def test_board_engine(self):
+        original = n_queens.solve_n_queens_util
+        stats = SearchStats()
+        _, total = n_queens.solve_n_queens(6, engine="board", stats=stats)
+        summary = stats.summary()
+        self.assertEqual(total, 4)
+        self.assertEqual(summary["nodes"], 153)
+        self.assertEqual(summary["placements"], summary["nodes"] - 1)
+        self.assertEqual(summary["backtracks"], summary["placements"])
+        self.assertEqual(summary["checks"], sum(6 * row["nodes"] for row in summary["depths"][:6]))
+        self.assertEqual(summary["depths"][0]["branching"], {"6": 1})
+        self.assertEqual(summary["depths"][6]["nodes"], total)
+        for row in summary["depths"]:
+            # 每个节点的子节点数之和等于下一层的节点数
+            children = sum(int(k) * v for k, v in row["branching"].items())
+            self.assertEqual(children, row["placements"])
+        # 退出后恢复原函数，不再计数
+        self.assertIs(n_queens.solve_n_queens_util, original)
+        n_queens.solve_n_queens(6, engine="board")
+        self.assertEqual(stats.summary()["nodes"], 153)
+
+    def test_bitmask_engine_rejected(self):
+        with self.assertRaises(ValueError):
+            n_queens.solve_n_queens(6, stats=SearchStats())
+
+    def test_solvers_agree(self):
+        """LiuYuQiao 和马子恒的求解器与根目录棋盘引擎的搜索树相同"""
+        expected = SearchStats()
+        n_queens.solve_n_queens(7, engine="board", stats=expected)
+        liuyuqiao = load_solver("01_2023141461086_LiuYuQiao/n_queens.py", "liuyuqiao_n_queens")
+        mazhiheng = load_solver("01_2023141480044_马子恒/N-queen.py", "mazhiheng_n_queens")
+        # 集合标记和数组标记两种状态实现的搜索树也必须相同
+        solvers = [liuyuqiao.NQueens(7), liuyuqiao.NQueensArray(7),
+                   mazhiheng.NQueensSolver(7), mazhiheng.NQueensArraySolver(7)]
+        for solver in solvers:
+            with self.subTest(solver=type(solver).__name__):
+                stats = SearchStats()
+                with stats.attach(solver):
+                    solver.solve(True)
+                self.assertEqual(stats.summary(), expected.summary())
+                self.assertNotIn("backtrack", vars(solver))
+
+
+if __name__ == "__main__":
+    unittest.main()
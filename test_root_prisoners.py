@@ -0,0 +1,411 @@
+"""
+根目录 one_hundred.py 的测试
+"""
+
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from fractions import Fraction
+
+import numpy as np
+
+from one_hundred import (CycleStats, PrisonerSimulator, batch_max_cycle_lengths,
+                         exact_success_probability, max_cycle_length)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def max_cycle_length_reference(boxes):
+    """逐个元素走循环的参考实现"""
+    visited = [False] * len(boxes)
+    longest = 0
+    for i in range(len(boxes)):
+        length = 0
+        current = i
+        while not visited[current]:
+            visited[current] = True
+            length += 1
+            current = boxes[current]
+        longest = max(longest, length)
+    return longest
+
+
+class TestBatchSimulation(unittest.TestCase):
+    """向量化批量模拟测试"""
+
+    def test_batch_max_cycle_lengths(self):
+        rng = np.random.default_rng(0)
+        for n in (1, 2, 7, 100):
+            with self.subTest(n=n):
+                boxes = rng.permuted(np.tile(np.arange(n), (50, 1)), axis=1)
+                expected = [max_cycle_length_reference(row) for row in boxes]
+                self.assertEqual(batch_max_cycle_lengths(boxes).tolist(), expected)
+
+    def test_matches_simulate_with_seed(self):
+        """固定种子时与逐次模拟的结果完全一致"""
+        results, rate = PrisonerSimulator(100, 50, seed=42).simulate(2000, 'loop', batch_size=300)
+        batch_results, batch_rate = PrisonerSimulator(100, 50, seed=42).simulate_batch(2000, batch_size=300)
+        self.assertEqual(batch_results.tolist(), results)
+        self.assertEqual(batch_rate, rate)
+
+    def test_random_strategy_batch_distribution(self):
+        """批量随机策略的成功率与 (K/N)^N 在统计误差内一致"""
+        n, k, trials = 10, 8, 200000
+        expected = (k / n) ** n
+        _, rate = PrisonerSimulator(n, k, seed=3).simulate_batch(trials, batch_size=50000, strategy='random')
+        sigma = (expected * (1 - expected) / trials) ** 0.5
+        self.assertLess(abs(rate - expected), 5 * sigma)
+
+    def test_random_strategy_batch_edge_cases(self):
+        self.assertTrue(PrisonerSimulator(10, 10).random_strategy_batch(5).all())
+        self.assertFalse(PrisonerSimulator(10, 0).random_strategy_batch(5).any())
+
+    def test_random_strategy_stops_at_first_failure(self):
+        """第一个囚犯失败后不再为其余囚犯抽盒子"""
+        simulator = PrisonerSimulator(100, 1)
+        calls = []
+
+        class FixedChoice:
+            def choice(self, n, k, replace=False):
+                calls.append(k)
+                return np.array([0])
+
+        simulator.rng = FixedChoice()
+        boxes = np.arange(100)[::-1].copy()  # 0 号盒子里是 99，囚犯 0 必然失败
+        self.assertFalse(simulator.random_strategy(boxes))
+        self.assertEqual(len(calls), 1)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            PrisonerSimulator().simulate_batch(10, strategy='unknown')
+
+    def test_same_seed_any_worker_count(self):
+        """相同种子在不同进程数下得到逐位相同的结果"""
+        for strategy in ('loop', 'random'):
+            with self.subTest(strategy=strategy):
+                single, _ = PrisonerSimulator(50, 25, seed=7).simulate_batch(3000, 500, strategy)
+                pooled, _ = PrisonerSimulator(50, 25, seed=7).simulate_batch(3000, 500, strategy, workers=3)
+                self.assertEqual(single.tolist(), pooled.tolist())
+
+    def test_different_seeds_differ(self):
+        first, _ = PrisonerSimulator(50, 25, seed=1).simulate_batch(2000, 500)
+        second, _ = PrisonerSimulator(50, 25, seed=2).simulate_batch(2000, 500)
+        self.assertNotEqual(first.tolist(), second.tolist())
+
+    def test_sweep_matches_batch_simulation(self):
+        """单次抽样的 K 扫描与同一批排列上逐个 K 的模拟一致"""
+        rates = PrisonerSimulator(60, 30, seed=11).parameter_sweep([10, 30, 45, 60], T=4000)
+        for K in (10, 30, 45, 60):
+            with self.subTest(K=K):
+                _, rate = PrisonerSimulator(60, K, seed=11).simulate_batch(4000)
+                self.assertEqual(rates[K], rate)
+
+    def test_max_cycle_histogram(self):
+        hist = PrisonerSimulator(30, 15, seed=5).max_cycle_histogram(1000, batch_size=300)
+        self.assertEqual(len(hist), 31)
+        self.assertEqual(hist.sum(), 1000)
+        self.assertEqual(hist[0], 0)
+
+
+class TestMaxCycleLength(unittest.TestCase):
+    """最长循环核函数测试"""
+
+    def test_matches_reference(self):
+        rng = np.random.default_rng(1)
+        for n in (1, 2, 10, 100):
+            for _ in range(20):
+                boxes = rng.permutation(n)
+                with self.subTest(n=n):
+                    self.assertEqual(max_cycle_length(boxes), max_cycle_length_reference(boxes))
+
+    def test_limit_fast_path(self):
+        """超过 limit 时立即返回 limit + 1"""
+        cycle = list(range(1, 100)) + [0]
+        self.assertEqual(max_cycle_length(cycle), 100)
+        self.assertEqual(max_cycle_length(cycle, 50), 51)
+        self.assertEqual(max_cycle_length([1, 0, 2], 2), 2)
+
+    def test_loop_strategy(self):
+        simulator = PrisonerSimulator(10, 5)
+        self.assertTrue(simulator.loop_strategy(np.array([1, 2, 3, 4, 0, 6, 7, 8, 9, 5])))
+        self.assertFalse(simulator.loop_strategy(np.array([1, 2, 3, 4, 5, 0, 7, 8, 9, 6])))
+
+
+class TestCycleStats(unittest.TestCase):
+    """循环长度计数器测试"""
+
+    def test_counts_match_reference(self):
+        rng = np.random.default_rng(2)
+        boxes = rng.permuted(np.tile(np.arange(12), (40, 1)), axis=1)
+        stats = CycleStats(12).update(boxes[:25]).merge(CycleStats(12).update(boxes[25:]))
+
+        cycle_counts = np.zeros(13, dtype=np.int64)
+        max_counts = np.zeros(13, dtype=np.int64)
+        for row in boxes:
+            lengths = []
+            visited = [False] * 12
+            for start in range(12):
+                length = 0
+                current = start
+                while not visited[current]:
+                    visited[current] = True
+                    length += 1
+                    current = row[current]
+                if length:
+                    lengths.append(length)
+            for length in lengths:
+                cycle_counts[length] += 1
+            max_counts[max(lengths)] += 1
+
+        self.assertEqual(stats.trials, 40)
+        self.assertEqual(stats.cycle_length_counts.tolist(), cycle_counts.tolist())
+        self.assertEqual(stats.max_cycle_counts.tolist(), max_counts.tolist())
+        self.assertEqual(stats.success_curve()[-1], 1.0)
+
+    def test_workers_give_same_stats(self):
+        single = PrisonerSimulator(40, 20, seed=9).cycle_stats(2000, batch_size=250)
+        pooled = PrisonerSimulator(40, 20, seed=9).cycle_stats(2000, batch_size=250, workers=2)
+        self.assertEqual(single.cycle_length_counts.tolist(), pooled.cycle_length_counts.tolist())
+        self.assertEqual(single.max_cycle_counts.tolist(), pooled.max_cycle_counts.tolist())
+
+
+class TestExactSuccessProbability(unittest.TestCase):
+    """精确成功率测试"""
+
+    def test_half_matches_harmonic_formula(self):
+        for n in (2, 10, 100):
+            with self.subTest(n=n):
+                expected = 1 - sum(Fraction(1, i) for i in range(n // 2 + 1, n + 1))
+                self.assertEqual(exact_success_probability(n, n // 2, exact=True), expected)
+
+    def test_matches_enumeration(self):
+        """与穷举全部排列的结果一致"""
+        n = 7
+        perms = list(itertools.permutations(range(n)))
+        for k in range(0, n + 1):
+            with self.subTest(k=k):
+                good = sum(max_cycle_length(p) <= k for p in perms)
+                self.assertEqual(exact_success_probability(n, k, exact=True), Fraction(good, len(perms)))
+                self.assertAlmostEqual(exact_success_probability(n, k), good / len(perms))
+
+    def test_analytic_sweep(self):
+        rates = PrisonerSimulator(100, 50).parameter_sweep([25, 50, 100], analytic=True)
+        self.assertAlmostEqual(rates[50], 0.3118278206898048)
+        self.assertEqual(rates[100], 1.0)
+        self.assertLess(rates[25], rates[50])
+
+
+def load_student_module(relpath, name):
+    """按路径加载作业目录里的模拟脚本；登记到 sys.modules，进程池才能找到其中的函数"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relpath))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestStudentWorkerPools(unittest.TestCase):
+    """张雄和 Zhaoweiyi 的分块进程池模拟：相同种子下与进程数无关，合并后的总数等于模拟轮数"""
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        cls.zhang = load_student_module(os.path.join("02-2023141461071-张雄", "Prisoner.py"),
+                                        "zhangxiong_prisoner")
+        cls.zhao = load_student_module(os.path.join("02_2023141461101_Zhaoweiyi", "prisoner_problem.py"),
+                                       "zhaoweiyi_prisoner_problem")
+
+    def test_zhang_same_seed_any_worker_count(self):
+        for strategy in ('cycle', 'random'):
+            with self.subTest(strategy=strategy):
+                results = [self.zhang.PrisonerSimulator(30, 15, seed=3).run_simulation(
+                    1100, strategy, verbose=False, workers=workers, chunk_size=250) for workers in (1, 3)]
+                single, pooled = results
+                self.assertEqual(single['success_hist'].tolist(), pooled['success_hist'].tolist())
+                self.assertEqual(single['max_cycle_hist'].tolist(), pooled['max_cycle_hist'].tolist())
+                self.assertEqual(single['all_success'], pooled['all_success'])
+                for result in results:
+                    self.assertEqual(result['success_hist'].sum(), 1100)
+                    self.assertEqual(result['max_cycle_hist'].sum(), 1100)
+                    self.assertEqual(result['all_success'], result['success_hist'][30])
+                    if strategy == 'cycle':
+                        # 循环策略下全体成功当且仅当最长循环不超过 K
+                        self.assertEqual(result['all_success'], result['max_cycle_hist'][:16].sum())
+
+    def test_zhaoweiyi_same_seed_any_worker_count(self):
+        self.zhao.HEADLESS = True  # 不显示进度条
+        simulators = []
+        for workers in (1, 3):
+            simulator = self.zhao.PrisonerProblemSimulator(30, 15, T=700, seed=3)
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulator.run_simulation(workers=workers, chunk_size=200)
+            simulators.append(simulator)
+        single, pooled = simulators
+        self.assertEqual(single.success_counts, pooled.success_counts)
+        self.assertEqual(single.max_cycle_hist.tolist(), pooled.max_cycle_hist.tolist())
+        for simulator in simulators:
+            self.assertEqual(simulator.max_cycle_hist.sum(), 700)
+            self.assertEqual(simulator.success_counts['cycle'], simulator.max_cycle_hist[:16].sum())
+            self.assertLessEqual(simulator.success_counts['random'], 700)
+
+    def test_zhaoweiyi_repeated_run_starts_fresh(self):
+        """同一个模拟器再次运行时重新统计，成功率不会超过 1"""
+        self.zhao.HEADLESS = True
+        simulator = self.zhao.PrisonerProblemSimulator(30, 15, T=500, seed=5)
+        for _ in range(2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulator.run_simulation(chunk_size=200)
+            self.assertEqual(simulator.max_cycle_hist.sum(), 500)
+            self.assertEqual(simulator.success_counts['cycle'], simulator.max_cycle_hist[:16].sum())
+            for strategy in ('random', 'cycle'):
+                self.assertLessEqual(simulator.success_rates[strategy], 1)
+                self.assertEqual(simulator.success_rates[strategy],
+                                 simulator.success_counts[strategy] / 500)
+
+
+class TestZhangCycleStats(unittest.TestCase):
+    """张雄的循环长度计数器：接口与 one_hundred.CycleStats 相同，统计量与直接对样本计算的一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        cls.zhang = load_student_module(os.path.join("02-2023141461071-张雄", "Prisoner.py"),
+                                        "zhangxiong_prisoner")
+
+    def test_matches_root_cycle_stats(self):
+        boxes = np.random.default_rng(4).permuted(np.tile(np.arange(20), (60, 1)), axis=1)
+        stats = self.zhang.CycleStats(20).update(boxes[:25]).merge(self.zhang.CycleStats(20).update(boxes[25:]))
+        expected = CycleStats(20).update(boxes)
+        self.assertEqual(stats.N, expected.N)
+        self.assertEqual(stats.trials, expected.trials)
+        self.assertEqual(stats.cycle_length_counts.tolist(), expected.cycle_length_counts.tolist())
+        self.assertEqual(stats.max_cycle_counts.tolist(), expected.max_cycle_counts.tolist())
+        np.testing.assert_allclose(stats.success_curve(), expected.success_curve())
+
+    def test_matches_numpy_statistics(self):
+        simulator = self.zhang.PrisonerSimulator(20, 10, seed=4)
+        for trials in (1, 2, 7, 50, 51):
+            with self.subTest(trials=trials):
+                boxes = np.array([simulator.generate_boxes() for _ in range(trials)])
+                stats = self.zhang.CycleStats(20).update(boxes)
+                longest = batch_max_cycle_lengths(boxes)
+                self.assertEqual(stats.max_cycle_median(), float(np.median(longest)))
+                self.assertAlmostEqual(stats.max_cycle_mean(), np.mean(longest))
+                self.assertAlmostEqual(stats.max_cycle_std(), np.std(longest))
+
+    def test_even_median_averages_middle_values(self):
+        # 最长循环分别为 17 和 18 的两个排列
+        boxes = [np.roll(np.arange(20), 1) for _ in range(2)]
+        boxes[0][:17] = np.roll(np.arange(17), 1)
+        boxes[0][17:] = [18, 19, 17]
+        boxes[1][:18] = np.roll(np.arange(18), 1)
+        boxes[1][18:] = [19, 18]
+        stats = self.zhang.CycleStats(20).update(np.array(boxes))
+        self.assertEqual(stats.max_cycle_counts[17], 1)
+        self.assertEqual(stats.max_cycle_counts[18], 1)
+        self.assertEqual(stats.max_cycle_median(), 17.5)
+
+    def test_empty(self):
+        stats = self.zhang.CycleStats(20)
+        self.assertEqual(stats.max_cycle_mean(), 0.0)
+        self.assertEqual(stats.max_cycle_std(), 0.0)
+        self.assertEqual(stats.max_cycle_median(), 0.0)
+        self.assertEqual(stats.success_curve().tolist(), [0.0] * 21)
+
+
+class TestZhaoweiyiExactRate(unittest.TestCase):
+    """Zhaoweiyi 的理论成功率与参数分析改用精确递推"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.zhao = load_student_module(os.path.join("02_2023141461101_Zhaoweiyi", "prisoner_problem.py"),
+                                       "zhaoweiyi_prisoner_problem")
+
+    def test_matches_exact_probability(self):
+        for N, K in ((100, 50), (100, 30), (60, 42), (7, 3), (10, 1), (20, 20), (20, 25)):
+            with self.subTest(N=N, K=K):
+                self.assertAlmostEqual(self.zhao.no_long_cycle_probability(N, K),
+                                       exact_success_probability(N, K), places=12)
+        simulator = self.zhao.PrisonerProblemSimulator(100, 50, T=1)
+        self.assertAlmostEqual(simulator.theoretical_success_rate(), 0.3118278206898048)
+
+
+class TestLiXinaiPrison(unittest.TestCase):
+    """李忻嫒的精确理论成功率、最长循环直方图抽样和解析参数分析"""
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        cls.prison = load_student_module(os.path.join("02_2022141430166_李忻嫒", "prison.py"), "lixinai_prison")
+
+    def test_matches_exact_probability(self):
+        for n, k in ((100, 50), (100, 30), (60, 42), (7, 3), (10, 1), (20, 20), (20, 25), (20, 0)):
+            with self.subTest(n=n, k=k):
+                self.assertAlmostEqual(self.prison.calculate_theoretical_success_rate(n, k),
+                                       exact_success_probability(n, k), places=12)
+        # 自底向上计算，N 远大于递归层数限制时也不会溢出
+        self.assertAlmostEqual(self.prison.calculate_theoretical_success_rate(5000, 2500),
+                               exact_success_probability(5000, 2500), places=12)
+
+    def test_max_cycle_length(self):
+        rng = np.random.default_rng(8)
+        for _ in range(50):
+            perm = rng.permutation(15)
+            # prison.py 的盒子里是从 1 开始的纸条编号
+            self.assertEqual(self.prison.max_cycle_length((perm + 1).tolist()),
+                             batch_max_cycle_lengths(perm[None, :])[0])
+
+    def test_sample_max_cycle_histogram(self):
+        hist = self.prison.sample_max_cycle_histogram(12, 300)
+        self.assertEqual(len(hist), 13)
+        self.assertEqual(sum(hist), 300)
+        self.assertEqual(hist[0], 0)
+
+    def test_analytic_parameter_analysis(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.prison.plot_parameter_analysis(40, analytic=True)
+            finally:
+                os.chdir(cwd)
+                self.prison.plt.close("all")
+            self.assertEqual(os.listdir(tmp), ["analyze40.png"])
+
+
+class TestHeadless(unittest.TestCase):
+    """无界面批处理模式测试"""
+
+    def run_python(self, code, cwd=None):
+        root = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PRISONERS_HEADLESS="1", PYTHONPATH=root)
+        return subprocess.run([sys.executable, "-c", code], cwd=cwd or root, env=env,
+                              capture_output=True, text=True, check=True).stdout
+
+    def test_import_does_not_load_plotting(self):
+        out = self.run_python("import sys, one_hundred; "
+                              "print(sorted(m for m in ('matplotlib', 'seaborn', 'tqdm') if m in sys.modules))")
+        self.assertEqual(out.strip(), "[]")
+
+    def test_import_does_not_load_pool_or_fractions(self):
+        # 进程池和 Fraction 只在 workers > 1、exact=True 时才导入
+        out = self.run_python("import sys, one_hundred; "
+                              "print(sorted(m for m in ('concurrent.futures', 'fractions') if m in sys.modules))")
+        self.assertEqual(out.strip(), "[]")
+
+    def test_main_writes_figures_without_prompting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.run_python("import one_hundred; one_hundred.main(['-N', '20', '-K', '10', '-T', '200'])",
+                            cwd=tmp)
+            self.assertEqual(sorted(os.listdir(tmp)), ['loop_distribution.png', 'prisoners_comparison.png'])
+
+
+if __name__ == "__main__":
+    unittest.main()